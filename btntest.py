@@ -1,143 +1,216 @@
-# btntests.py
-# button , paddle, speaker and display tester for game board
-# Use common game module "gameESP.py" for ESP8266  or ESP32
-# by Billy Cheung  2019 10 26
-#
-#  ESP32 Game board (follow same pin layout as the Odroid_go)
-
-# OLED SPI
-# ========
-# VCC    -        3V3
-# GND    -       GND
-# D0/SCK  -   IO18-VSPI-SCK
-# D1/MOSI  - IO23-VSPI-MOSI
-# RES        -    IO4 for ESP32
-# DC         -      IO21
-# CS          -      IO5-VSPI CS0
-# LED/BLK -    IO14
-
-# MISO     -      IO19-VSPI-MISO
-
-# Audio
-# ======
-# Speaker-  GND
-# Speaker+ - 10K VR- IO26
-
-# Paddle (10K VR)
-# ======
-# GND
-# VN/IO39
-# -VCC
-#
-# D-PAD Buttons
-# =============
-# tie one end to 3V3
-# UP              IO35-10K-GND
-# Down-10K IO35
-# Left            IO34-10K-GND
-# Right-10K IO34
-
-# Other Buttons
-# ============
-# tie one end to GND
-# Menu    IO13
-# Volume IO00-10K-3v3
-# Select   IO27
-# Start     IO39(VN)-10K-3v3
-# B           IO33
-# A           IO32
-#
-
-import gc
-import sys
-gc.collect()
-print (gc.mem_free())
-import network
-import utime
-from utime import sleep_ms,ticks_ms, ticks_us, ticks_diff
-from machine import  ADC
-# all dislplay, buttons, paddle, sound logics are in game32.mpy module
-from gameESP import *
-g=gameESP()
-tone_dur = 20
-
-# while not (pressed(btnL) and pressed(btnA)):
-while True :
-
-
-
-  g.display.fill(0)
-  g.display.text("B+L=Exit", 40,54,1)
-
-  g.getBtn()
-  g.setVol()
-
-  if g.ESP32 :
-      # get ESP32  button's ADC value
-      g.display.text ("X:{}".format(g.adcX.read()), 0,10,1)
-      g.display.text ("Y:{}".format(g.adcY.read()), 60,10,1)
-
-      g.display.text ("P:{}".format(g.getPaddle()), 0,0,1)
-      g.display.text ("Vol:{}".format(g.vol),60 ,0,1)
-  else :
-      #get ESP8266 button's ADC valu
-      g.display.text ("Btn:{}".format(g.adc.read()), 0,0,1)
-      g.display.text ("Vol:{}".format(g.vol),60 ,0,1)
-
-      g.display.text ("P:{}".format(g.getPaddle()), 0,10,1)
-      g.display.text ("P2:{}".format(g.getPaddle2()), 60,10,1)
-
-
-
-
-
-
-  if g.pressed(g.btnB) and g.justReleased(g.btnL):
-     g.display.text("Bye!",10, 30,1)
-     g.playTone('e4', tone_dur)
-     g.playTone('c4', tone_dur)
-     g.display.show()
-     break
-
-  if g.pressed (g.btnU):
-     g.display.text("U",20, 20,1)
-     g.playTone('c4', tone_dur)
-  else :
-     g.display.text(":",20, 20,1)
-  if g.pressed(g.btnL):
-     g.display.text("L",0, 35,1)
-     g.playTone('d4', tone_dur)
-  else :
-     g.display.text(":",0, 35,1)
-  if g.pressed(g.btnR):
-     g.display.text("R",40, 35,1)
-     g.playTone('e4', tone_dur)
-  else :
-     g.display.text(":",40, 35,1)
-
-  if g.pressed(g.btnD):
-     g.display.text("D",20, 50,1)
-     g.playTone('f4', tone_dur)
-
-  else :
-     g.display.text(":",20, 50,1)
-  if g.pressed(g.btnA):
-     g.display.text("A",80, 40,1)
-     g.playTone('c5', tone_dur)
-  else :
-     g.display.text(":",80, 40,1)
-  if g.pressed(g.btnB):
-    g.display.text("B",100, 30,1)
-    g.playTone('d5', tone_dur)
-  else :
-     g.display.text(":",100, 30,1)
-
-
-
-  g.display.show()
-  sleep_ms(5)
-
-if g.ESP32 :
-    g.deinit()
-    del sys.modules["gameESP"]
-gc.collect()
+# btntests.py
+# button , paddle, speaker and display tester for game board
+# Use common game module "gameESP.py" for ESP8266  or ESP32
+# by Billy Cheung  2019 10 26
+#
+#  ESP32 Game board (follow same pin layout as the Odroid_go)
+
+# OLED SPI
+# ========
+# VCC    -        3V3
+# GND    -       GND
+# D0/SCK  -   IO18-VSPI-SCK
+# D1/MOSI  - IO23-VSPI-MOSI
+# RES        -    IO4 for ESP32
+# DC         -      IO21
+# CS          -      IO5-VSPI CS0
+# LED/BLK -    IO14
+
+# MISO     -      IO19-VSPI-MISO
+
+# Audio
+# ======
+# Speaker-  GND
+# Speaker+ - 10K VR- IO26
+
+# Paddle (10K VR)
+# ======
+# GND
+# VN/IO39
+# -VCC
+#
+# D-PAD Buttons
+# =============
+# tie one end to 3V3
+# UP              IO35-10K-GND
+# Down-10K IO35
+# Left            IO34-10K-GND
+# Right-10K IO34
+
+# Other Buttons
+# ============
+# tie one end to GND
+# Menu    IO13
+# Volume IO00-10K-3v3
+# Select   IO27
+# Start     IO39(VN)-10K-3v3
+# B           IO33
+# A           IO32
+#
+
+import gc
+import sys
+gc.collect()
+print (gc.mem_free())
+import network
+import utime
+from utime import sleep_ms,ticks_ms, ticks_us, ticks_diff
+from machine import  ADC
+# all dislplay, buttons, paddle, sound logics are in game32.mpy module
+from gameESP import *
+g=gameESP()
+tone_dur = 20
+
+def ladderSample() :
+  # average of 16 readings, None while the value is still moving
+  lo = hi = total = g.readLadder()
+  for i in range(15) :
+    sleep_ms(2)
+    v = g.readLadder()
+    total += v
+    lo = min(lo, v)
+    hi = max(hi, v)
+  return total >> 4 if hi - lo <= 8 else None
+
+def calibrate() :
+  # guided button ladder calibration for the SPI board. each combination
+  # the ladder can tell apart is held until its reading settles, then let
+  # go, and the thresholds half way between them are saved to flash
+  combos = ((0, '(nothing)'), (g.btnU, 'U'), (g.btnD, 'D'), (g.btnL, 'L'),
+            (g.btnR, 'R'), (g.btnA, 'A'), (g.btnB, 'B'),
+            (g.btnU | g.btnD, 'U+D'), (g.btnU | g.btnA, 'U+A'),
+            (g.btnU | g.btnB, 'U+B'), (g.btnD | g.btnA, 'D+A'),
+            (g.btnD | g.btnB, 'D+B'), (g.btnL | g.btnA, 'L+A'),
+            (g.btnL | g.btnB, 'L+B'), (g.btnR | g.btnA, 'R+A'),
+            (g.btnR | g.btnB, 'R+B'), (g.btnA | g.btnB, 'A+B'))
+  readings = []
+  idle = 0
+  for btns, name in combos :
+    g.display.fill(0)
+    g.display.text('CALIBRATE {}/{}'.format(len(readings) + 1, len(combos)), 0, 0, 1)
+    g.display.text('Hold', 0, 20, 1)
+    g.display.text(name, 40, 20, 1)
+    g.display.text('until the beep', 0, 40, 1)
+    g.display.show()
+    v = None
+    while v is None or (btns and v < idle + 30) :
+      v = ladderSample()
+    readings.append((v, btns))
+    if not btns :
+      idle = v
+      continue
+    g.playTone('c5', tone_dur)
+    g.display.fill_rect(0, 40, 128, 8, 0)
+    g.display.text('let go', 0, 40, 1)
+    g.display.show()
+    while g.readLadder() >= idle + 30 :
+      sleep_ms(10)
+    sleep_ms(100)
+  readings.sort()
+  g.display.fill(0)
+  for i in range(len(readings) - 1) :
+    if readings[i + 1][0] - readings[i][0] < 16 :
+      # too close to tell apart reliably, keep the old table
+      g.display.text('Too close:', 0, 20, 1)
+      g.display.text('{} {}'.format(readings[i][0], readings[i + 1][0]), 0, 30, 1)
+      g.display.show()
+      g.playTone('c4', 200)
+      sleep_ms(2000)
+      return False
+  g.ladder.calibrate(readings)
+  g.ladder.save()
+  g.display.text('Saved to', 0, 20, 1)
+  g.display.text(g.ladder.FILE, 0, 30, 1)
+  g.display.show()
+  g.playTone('c5', tone_dur)
+  g.playTone('e5', tone_dur)
+  sleep_ms(2000)
+  return True
+
+# while not (pressed(btnL) and pressed(btnA)):
+while True :
+
+
+
+  g.display.fill(0)
+  if g.ESP32 or not g.useSPI :
+      g.display.text("B+L=Exit", 40,54,1)
+  else :
+      g.display.text("B+R=Cal B+L=Exit", 0,54,1)
+
+  g.getBtn()
+  g.setVol()
+
+  if g.ESP32 :
+      # get ESP32  button's ADC value
+      g.display.text ("X:{}".format(g.adcX.read()), 0,10,1)
+      g.display.text ("Y:{}".format(g.adcY.read()), 60,10,1)
+
+      g.display.text ("P:{}".format(g.getPaddle()), 0,0,1)
+      g.display.text ("Vol:{}".format(g.vol),60 ,0,1)
+  else :
+      #get ESP8266 button's ADC valu
+      g.display.text ("Btn:{}".format(g.adc.read()), 0,0,1)
+      g.display.text ("Vol:{}".format(g.vol),60 ,0,1)
+
+      g.display.text ("P:{}".format(g.getPaddle()), 0,10,1)
+      g.display.text ("P2:{}".format(g.getPaddle2()), 60,10,1)
+
+
+
+
+
+
+  if not g.ESP32 and g.useSPI and g.pressed(g.btnB) and g.justPressed(g.btnR):
+     calibrate()
+     continue
+
+  if g.pressed(g.btnB) and g.justReleased(g.btnL):
+     g.display.text("Bye!",10, 30,1)
+     g.playTone('e4', tone_dur)
+     g.playTone('c4', tone_dur)
+     g.display.show()
+     break
+
+  if g.pressed (g.btnU):
+     g.display.text("U",20, 20,1)
+     g.playTone('c4', tone_dur)
+  else :
+     g.display.text(":",20, 20,1)
+  if g.pressed(g.btnL):
+     g.display.text("L",0, 35,1)
+     g.playTone('d4', tone_dur)
+  else :
+     g.display.text(":",0, 35,1)
+  if g.pressed(g.btnR):
+     g.display.text("R",40, 35,1)
+     g.playTone('e4', tone_dur)
+  else :
+     g.display.text(":",40, 35,1)
+
+  if g.pressed(g.btnD):
+     g.display.text("D",20, 50,1)
+     g.playTone('f4', tone_dur)
+
+  else :
+     g.display.text(":",20, 50,1)
+  if g.pressed(g.btnA):
+     g.display.text("A",80, 40,1)
+     g.playTone('c5', tone_dur)
+  else :
+     g.display.text(":",80, 40,1)
+  if g.pressed(g.btnB):
+    g.display.text("B",100, 30,1)
+    g.playTone('d5', tone_dur)
+  else :
+     g.display.text(":",100, 30,1)
+
+
+
+  g.display.show()
+  sleep_ms(5)
+
+if g.ESP32 :
+    g.deinit()
+    del sys.modules["gameESP"]
+gc.collect()
@@ -0,0 +1,95 @@
+# gameAsync.py
+#
+# g.run() as cooperative uasyncio tasks, for game8266.py and game32.py.
+# only games that import it pay for it, the gameESP module does not
+#
+#       from gameAsync import runAsync
+#       runAsync(g, update, draw)
+#
+# the tasks: input sampling, the frame loop, the display flush, with the
+# sfx() channel playing the sounds. playTone and playSound queue their sound
+# instead of sleeping, async code can await playToneAsync(),
+# playSoundAsync() and frameTick().
+# without uasyncio runAsync() is plain g.run()
+try :
+    import uasyncio as asyncio
+except ImportError :
+    asyncio = None
+
+
+def runAsync(g, update, draw, tickRate=0) :
+    if asyncio is None :
+        return g.run(update, draw, tickRate)
+    asyncio.run(mainTask(g, update, draw, tickRate))
+
+async def mainTask(g, update, draw, tickRate) :
+    g.frameEvent = asyncio.Event()
+    g.flushGo = asyncio.Event()
+    g.flushDone = asyncio.Event()
+    g.startSfx()
+    # the timer sampler of the ESP8266 SPI board reads the mux better than
+    # a task can, where there is none inputTask() reads the inputs
+    sampler = g.startSampler()
+    if not g.sampling :
+        g.btnNow = g.btnLatch = g.readBtns()
+        g.paddleNow = g.readPaddle()
+        g.paddle2Now = 0
+    g.asyncOn = True
+    tasks = (asyncio.create_task(flushTask(g)),)
+    if not g.sampling :
+        tasks += (asyncio.create_task(inputTask(g)),)
+    try :
+        await frameTask(g, update, draw, tickRate)
+    finally :
+        g.asyncOn = False
+        for t in tasks :
+            t.cancel()
+        if sampler :
+            g.stopSampler()
+        await asyncio.sleep_ms(0)
+
+async def inputTask(g) :
+    # buttons and paddle every inputPeriod ms, a press in between is latched
+    while True :
+        b = g.readBtns()
+        g.btnNow = b
+        g.btnLatch |= b
+        g.paddleNow = g.readPaddle()
+        await asyncio.sleep_ms(g.inputPeriod)
+
+async def frameTask(g, update, draw, tickRate, maxSkip=5) :
+    # the run() loop, handing frames to flushTask() and sleeping by yielding
+    g.startTicks(tickRate)
+    while True :
+        n = g.runTicks(update, maxSkip)
+        if n < 0 :
+            return
+        if n :
+            draw()
+            g.flushDone.clear()
+            g.flushGo.set()
+            await g.flushDone.wait()
+            g.frameDone()
+            g.frameEvent.set()
+            g.frameEvent.clear()
+        await asyncio.sleep_ms(max(g.tickWait(), 0))
+
+async def frameTick(g) :
+    # returns once the next frame has been shown
+    await g.frameEvent.wait()
+
+async def flushTask(g) :
+    while True :
+        await g.flushGo.wait()
+        g.flushGo.clear()
+        g.display.show()
+        g.flushDone.set()
+
+async def playToneAsync(g, tone, tone_duration, rest_duration=0) :
+    await playSoundAsync(g, tone, tone_duration, rest_duration)
+
+async def playSoundAsync(g, freq, tone_duration, rest_duration=0) :
+    # queued on the sfx() channel like any other sound, so it takes the
+    # voices the way sfx() does, then waits for as long as it plays
+    g.sfx(freq, tone_duration, rest_duration)
+    await asyncio.sleep_ms(tone_duration + rest_duration)
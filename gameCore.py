@@ -0,0 +1,1282 @@
+# gameCore.py
+#
+# the part of gameESP that is the same on every board, imported by
+# game8266.py and game32.py: the SSD1306 driver with its dirty tracking,
+# the gameCore class gameESP is built on (buttons, input logging, sound
+# effects, songs, frame timing) and the Rect, Sprite and PaddleFilter
+# helpers. copy it to the flash next to gameESP.py, or compile it with
+#        mpy-cross gameCore.py
+# and copy gameCore.mpy. games keep importing gameESP.
+# what only some games use is in modules of its own, imported when used:
+# gameHud.py, gameTileMap.py, gameAsync.py by the games, gameStats.py,
+# gameProfiler.py, gameGovernor.py, gameLog.py by the start / record
+# methods, gameLadder.py by the ESP8266 SPI board
+#
+import utime
+from utime import sleep_ms,ticks_ms, ticks_us, ticks_diff, ticks_add
+from machine import Timer
+from random import getrandbits, seed
+from array import array
+# MicroPython SSD1306 OLED driver, I2C and SPI interfaces
+
+from micropython import const, schedule
+import framebuf
+
+
+# register definitions
+SET_CONTRAST        = const(0x81)
+SET_ENTIRE_ON       = const(0xa4)
+SET_NORM_INV        = const(0xa6)
+SET_DISP            = const(0xae)
+SET_MEM_ADDR        = const(0x20)
+SET_COL_ADDR        = const(0x21)
+SET_PAGE_ADDR       = const(0x22)
+SET_DISP_START_LINE = const(0x40)
+SET_SEG_REMAP       = const(0xa0)
+SET_MUX_RATIO       = const(0xa8)
+SET_COM_OUT_DIR     = const(0xc0)
+SET_DISP_OFFSET     = const(0xd3)
+SET_COM_PIN_CFG     = const(0xda)
+SET_DISP_CLK_DIV    = const(0xd5)
+SET_PRECHARGE       = const(0xd9)
+SET_VCOM_DESEL      = const(0xdb)
+SET_CHARGE_PUMP     = const(0x8d)
+SET_HSCROLL_RIGHT   = const(0x26)
+SET_HSCROLL_LEFT    = const(0x27)
+SET_VHSCROLL_RIGHT  = const(0x29)
+SET_VHSCROLL_LEFT   = const(0x2a)
+SET_SCROLL_OFF      = const(0x2e)
+SET_SCROLL_ON       = const(0x2f)
+SET_VSCROLL_AREA    = const(0xa3)
+
+# Subclassing FrameBuffer provides support for graphics primitives
+# http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
+class SSD1306(framebuf.FrameBuffer):
+    def __init__(self, width, height, external_vcc):
+        self.width = width
+        self.height = height
+        self.external_vcc = external_vcc
+        self.pages = self.height // 8
+        self.buffer = bytearray(self.pages * self.width)
+        self.view = memoryview(self.buffer)
+        # preallocated command buffers, a window is sent as one command run
+        self.cmd_buf = bytearray(6)
+        self.cmd_buf2 = bytearray(2)
+        # dirty tracking, column span touched on each page since the last show()
+        # a page is clean when dirty_lo > dirty_hi
+        # set track = False to always push the full frame
+        self.track = True
+        self.dirty_lo = bytearray(self.pages)
+        self.dirty_hi = bytearray(self.pages)
+        # display start line, see set_start_line() and vscroll()
+        self.start_line = 0
+        # bytes and transactions sent to the panel, reset by gameESP stats
+        self.bus_bytes = 0
+        self.bus_txns = 0
+        super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
+        self.init_display()
+
+    def init_display(self):
+        self.write_cmds(bytes((
+            SET_DISP | 0x00, # off
+            # address setting
+            SET_MEM_ADDR, 0x00, # horizontal
+            # resolution and layout
+            SET_DISP_START_LINE | 0x00,
+            SET_SEG_REMAP | 0x01, # column addr 127 mapped to SEG0
+            SET_MUX_RATIO, self.height - 1,
+            SET_COM_OUT_DIR | 0x08, # scan from COM[N] to COM0
+            SET_DISP_OFFSET, 0x00,
+            SET_COM_PIN_CFG, 0x02 if self.height == 32 else 0x12,
+            # timing and driving scheme
+            SET_DISP_CLK_DIV, 0x80,
+            SET_PRECHARGE, 0x22 if self.external_vcc else 0xf1,
+            SET_VCOM_DESEL, 0x30, # 0.83*Vcc
+            # display
+            SET_CONTRAST, 0xff, # maximum
+            SET_ENTIRE_ON, # output follows RAM contents
+            SET_NORM_INV, # not inverted
+            # charge pump
+            SET_CHARGE_PUMP, 0x10 if self.external_vcc else 0x14,
+            SET_DISP | 0x01))) # on
+        self.fill(0)
+        self.show(True)
+
+    def poweroff(self):
+        self.write_cmd(SET_DISP | 0x00)
+
+    def poweron(self):
+        self.write_cmd(SET_DISP | 0x01)
+
+    def contrast(self, contrast):
+        self.cmd_buf2[0] = SET_CONTRAST
+        self.cmd_buf2[1] = contrast
+        self.write_cmds(self.cmd_buf2)
+
+    def invert(self, invert):
+        self.write_cmd(SET_NORM_INV | (invert & 1))
+
+    # hardware scrolling
+    # the controller scrolls its own RAM, nothing is sent per frame.
+    # RAM must not be written while a continuous scroll runs, so stop it
+    # before the next show().
+
+    def hw_scroll(self, left=False, start=0, end=7, interval=7, vertical=0):
+        """Start a continuous horizontal or diagonal scroll.
+
+        Args:
+            left (bool): Scroll left instead of right.  Default is False.
+            start (int): First page to scroll.  Default is 0.
+            end (int): Last page to scroll.  Default is 7.
+            interval (int): Controller step code, frames between steps
+                0=5 1=64 2=128 3=256 4=3 5=4 6=25 7=2.  Default is 7.
+            vertical (int): Rows moved up per step for a diagonal scroll,
+                0 for horizontal only.  Default is 0.
+        """
+        if vertical:
+            self.write_cmds(bytes((SET_SCROLL_OFF,
+                SET_VSCROLL_AREA, 0, self.height,
+                SET_VHSCROLL_LEFT if left else SET_VHSCROLL_RIGHT,
+                0x00, start, interval, end, vertical,
+                SET_SCROLL_ON)))
+        else:
+            self.write_cmds(bytes((SET_SCROLL_OFF,
+                SET_HSCROLL_LEFT if left else SET_HSCROLL_RIGHT,
+                0x00, start, interval, end, 0x00, 0xff,
+                SET_SCROLL_ON)))
+
+    def hw_scroll_stop(self):
+        # the scrolled RAM no longer matches the buffer, repaint it
+        self.write_cmd(SET_SCROLL_OFF)
+        self.show(True)
+
+    def set_start_line(self, line):
+        # screen row r shows RAM (buffer) row (r + start_line) % height
+        self.start_line = line % self.height
+        self.write_cmd(SET_DISP_START_LINE | self.start_line)
+
+    def ram_row(self, y):
+        # buffer row holding screen row y
+        return (y + self.start_line) % self.height
+
+    def vscroll(self, dy):
+        """Scroll the picture up by dy rows (down if dy < 0) by moving the
+        display start line. The newly exposed rows are cleared in the
+        buffer, so only their pages go out at the next show().
+
+        Returns:
+            int: buffer row of the first newly exposed row, draw the new
+                 rows there (use ram_row() for other screen positions).
+        """
+        h = self.height
+        old = self.start_line
+        self.set_start_line(old + dy)
+        if dy >= 0:
+            y = old
+        else:
+            y = self.start_line
+            dy = -dy
+        dy = min(dy, h)
+        # the exposed band may wrap around the bottom of the buffer
+        n = min(dy, h - y)
+        self.fill_rect(0, y, self.width, n, 0)
+        if dy > n:
+            self.fill_rect(0, 0, self.width, dy - n, 0)
+        return y
+
+    # dirty tracking
+    # every drawing call below records the area it touched, show() then only
+    # pushes the touched column span of each touched page.
+    # call mark() or invalidate() after writing into self.buffer directly.
+
+    def mark(self, x, y, w, h):
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        if x + w > self.width:
+            w = self.width - x
+        if y + h > self.height:
+            h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        x1 = x + w - 1
+        lo = self.dirty_lo
+        hi = self.dirty_hi
+        for p in range(y >> 3, ((y + h - 1) >> 3) + 1):
+            if x < lo[p]:
+                lo[p] = x
+            if x1 > hi[p]:
+                hi[p] = x1
+
+    def invalidate(self):
+        for p in range(self.pages):
+            self.dirty_lo[p] = 0
+            self.dirty_hi[p] = self.width - 1
+
+    def clean(self):
+        for p in range(self.pages):
+            self.dirty_lo[p] = 0xff
+            self.dirty_hi[p] = 0
+
+    def fill(self, c):
+        super().fill(c)
+        self.invalidate()
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.mark(x, y, 1, 1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.mark(x, y, w, 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.mark(x, y, 1, h)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.mark(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+
+    def rect(self, x, y, w, h, c):
+        super().rect(x, y, w, h, c)
+        self.mark(x, y, w, h)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.mark(x, y, w, h)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.mark(x, y, len(s) * 8, 8)
+
+    def scroll(self, dx, dy):
+        super().scroll(dx, dy)
+        self.invalidate()
+
+    def blit(self, fbuf, x, y, key=-1):
+        super().blit(fbuf, x, y, key)
+        # FrameBuffer does not expose its size, sources that carry
+        # width/height get a tight area, anything else repaints the frame
+        w = getattr(fbuf, 'width', 0)
+        h = getattr(fbuf, 'height', 0)
+        if w and h:
+            self.mark(x, y, w, h)
+        else:
+            self.invalidate()
+
+    def blit_raw(self, fbuf, x, y, key=-1):
+        # blit without dirty tracking, the caller marks the area itself
+        super().blit(fbuf, x, y, key)
+
+    def set_window(self, x0, x1, p0, p1):
+        if self.width == 64:
+            # displays with width of 64 pixels are shifted by 32
+            x0 += 32
+            x1 += 32
+        cmd = self.cmd_buf
+        cmd[0] = SET_COL_ADDR
+        cmd[1] = x0
+        cmd[2] = x1
+        cmd[3] = SET_PAGE_ADDR
+        cmd[4] = p0
+        cmd[5] = p1
+        self.write_cmds(cmd)
+
+    def show(self, full=False):
+        # push the dirty windows, dirty_lo / dirty_hi hold the span of each page
+        w = self.width
+        lo = self.dirty_lo
+        hi = self.dirty_hi
+        if self.track and not full:
+            # fall back to a full flush when the windows would cost as much,
+            # each window costs 6 command bytes on top of its data
+            n = 0
+            for p in range(self.pages):
+                if lo[p] <= hi[p]:
+                    n += hi[p] - lo[p] + 7
+            if n == 0:
+                return
+            full = n >= w * self.pages
+        else:
+            full = True
+        view = self.view
+        if full:
+            self.set_window(0, w - 1, 0, self.pages - 1)
+            self.write_data(view)
+        else:
+            for p in range(self.pages):
+                if lo[p] <= hi[p]:
+                    self.set_window(lo[p], hi[p], p, p)
+                    self.write_data(view[p * w + lo[p]:p * w + hi[p] + 1])
+        self.clean()
+
+    # sprites and images, MONO_VLSB data laid out page by page like the
+    # controller RAM: ((h + 7) // 8) rows of w bytes, bit 0 at the top
+
+    def block(self, x, p, w, pages, data):
+        """Write a page aligned block to the frame buffer and straight to
+        the controller window, without waiting for show().
+
+        Args:
+            x (int): Starting column.
+            p (int): Starting page (y // 8).
+            w (int): Width of the block.
+            pages (int): Height of the block in pages.
+            data (bytes): pages * w bytes of MONO_VLSB data.
+        """
+        W = self.width
+        for i in range(pages):
+            o = (p + i) * W + x
+            self.buffer[o:o + w] = data[i * w:(i + 1) * w]
+        self.set_window(x, x + w - 1, p, p + pages - 1)
+        self.write_data(data)
+
+    def draw_sprite(self, spr, x, y, frame=0, key=0, direct=False):
+        """Draw one frame of a Sprite.
+
+        Args:
+            spr (Sprite): Sprite to draw.
+            x (int): X position.
+            y (int): Y position.
+            frame (int): Frame of the sprite sheet.  Default is 0.
+            key (int): Colour left untouched, -1 for opaque.  Default is 0.
+            direct (bool): Push page aligned opaque sprites to the
+                controller at once instead of at the next show().
+        """
+        if spr.holes:
+            # punch the opaque area, then draw the lit pixels
+            super().blit(spr.holes[frame], x, y, 1)
+            super().blit(spr.frames[frame], x, y, 0)
+        elif (key == -1 and not (y | spr.height) & 7 and x >= 0 and y >= 0
+              and x + spr.width <= self.width and y + spr.height <= self.height):
+            # page aligned fast path, copy whole pages
+            w = spr.width
+            data = spr.view[frame * spr.size:(frame + 1) * spr.size]
+            if direct:
+                self.block(x, y >> 3, w, spr.pages, data)
+                return
+            W = self.width
+            for i in range(spr.pages):
+                o = ((y >> 3) + i) * W + x
+                self.buffer[o:o + w] = data[i * w:(i + 1) * w]
+        else:
+            super().blit(spr.frames[frame], x, y, key)
+        self.mark(x, y, spr.width, spr.height)
+
+    def draw_image(self, path, x=0, y=0, w=128, h=64):
+        """Draw a MONO_VLSB image from flash.
+
+        Args:
+            path (string): Image file path.
+            x (int): X coordinate of image left.  Default is 0.
+            y (int): Y coordinate of image top.  Default is 0.
+            w (int): Width of image.  Default is 128.
+            h (int): Height of image.  Default is 64.
+        """
+        if x < 0 or y < 0 or x + w > self.width or y + h > self.height:
+            return
+        row = None
+        with open(path, "rb") as f:
+            for i in range((h + 7) >> 3):
+                n = min(8, h - i * 8)
+                if n == 8 and not y & 7:
+                    # a whole page on a page boundary, read it into place
+                    o = ((y >> 3) + i) * self.width + x
+                    f.readinto(self.view[o:o + w])
+                else:
+                    # blit only the n rows, the pixels below are kept
+                    if row is None:
+                        row = bytearray(w)
+                    f.readinto(row)
+                    fb = framebuf.FrameBuffer(row, w, n, framebuf.MONO_VLSB)
+                    super().blit(fb, x, y + i * 8, -1)
+        self.mark(x, y, w, h)
+
+
+class SSD1306_I2C(SSD1306):
+    def __init__(self, width, height, i2c, addr=0x3c, external_vcc=False):
+        self.i2c = i2c
+        self.addr = addr
+        self.temp = bytearray(2)
+        self.write_list = [b'\x40', None] # Co=0, D/C#=1
+        self.cmd_list = [b'\x00', None] # Co=0, D/C#=0
+        super().__init__(width, height, external_vcc)
+
+    def write_cmd(self, cmd):
+        self.temp[0] = 0x80 # Co=1, D/C#=0
+        self.temp[1] = cmd
+        self.i2c.writeto(self.addr, self.temp)
+        self.bus_bytes += 3
+        self.bus_txns += 1
+
+    def write_cmds(self, cmds):
+        # a run of commands in a single I2C transaction
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+        # address and control byte go out too
+        self.bus_bytes += len(cmds) + 2
+        self.bus_txns += 1
+
+    def write_data(self, buf):
+        self.write_list[1] = buf
+        self.i2c.writevto(self.addr, self.write_list)
+        self.bus_bytes += len(buf) + 2
+        self.bus_txns += 1
+
+class SSD1306_SPI(SSD1306):
+    # cs is None where CS is wired to ground, the ESP8266 board reuses the
+    # CS pin to switch its input mux to paddle 2
+    def __init__(self, width, height, spi, dc, res, cs=None, external_vcc=False):
+        self.rate = 10 * 1024 * 1024
+        dc.init(dc.OUT, value=0)
+        res.init(res.OUT, value=0)
+        if cs :
+            cs.init(cs.OUT, value=1)
+        self.spi = spi
+        self.dc = dc
+        self.res = res
+        self.cs = cs
+        self.cmd1 = bytearray(1)
+        self.res(1)
+        sleep_ms(1)
+        self.res(0)
+        sleep_ms(10)
+        self.res(1)
+        super().__init__(width, height, external_vcc)
+
+    def write_cmd(self, cmd):
+        self.cmd1[0] = cmd
+        self.send(0, self.cmd1)
+
+    def write_cmds(self, cmds):
+        # a run of commands with a single bus init and DC toggle
+        self.send(0, cmds)
+
+    def write_data(self, buf):
+        self.send(1, buf)
+
+    def send(self, dc, buf):
+        cs = self.cs
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        if cs :
+            cs(1)
+        self.dc(dc)
+        if cs :
+            cs(0)
+        self.spi.write(buf)
+        self.bus_bytes += len(buf)
+        self.bus_txns += 1
+        if cs :
+            cs(1)
+
+# the frame phases g.lap() charges time to, see gameProfiler.py
+LAP_INPUT = const(0)
+LAP_UPDATE = const(1)
+LAP_COLLIDE = const(2)
+LAP_DRAW = const(3)
+LAP_SHOW = const(4)
+
+class gameCore (object):
+    max_vol = 6
+    # the sound effect timer, a virtual one where the port has them
+    sfxTimerId = -1
+    tones = {
+        ' ': 0,   # silence note
+        'c3': 131,
+        'd3': 147,
+        'e3': 165,
+        'f3': 175,
+        'f#3': 185,
+        'g3': 196,
+        'g#3': 208,
+        'a3': 220,
+        "a#3": 233,
+        'b3': 247,
+        'c4': 262,
+        'd4': 294,
+        'e4': 330,
+        'f4': 349,
+        'f#4': 370,
+        'g4': 392,
+        'g#4': 415,
+        'a4': 440,
+        "a#4": 466,
+        'b4': 494,
+        'c5': 523,
+        'c#5': 554,
+        'd5': 587,
+        'd#5': 622,
+        'e5': 659,
+        'f5': 698,
+        'f#5': 740,
+        'g5': 784,
+        'g#5': 831,
+        'a5': 880,
+        'b5': 988,
+# note the following can only be played by ESP32, as ESP8266 can play up to 1000Hz only.
+        'c6': 1047,
+        'c#6': 1109,
+        'd6': 1175
+    }
+
+    def __init__(self):
+        # the board's gameESP sets ESP32, useSPI, paddle2, voices, the
+        # display and the pins, then calls this
+        self.displayTimer = ticks_ms()
+        self.vol = int(self.max_vol/2) + 1
+        # volume of the music voice, setVol() moves it along with vol
+        self.bgmVol = self.vol
+        seed(ticks_us())
+        self.btnU = 1 << 1
+        self.btnL = 1 << 2
+        self.btnR = 1 << 3
+        self.btnD = 1 << 4
+        self.btnA = 1 << 5
+        self.btnB = 1 << 6
+        self.frameRate = 30
+        self.screenW = 128
+        self.screenH = 64
+        self.maxBgm = 1
+        self.bgm = 1
+        self.songIndex = 0
+        self.songStart = -1
+        self.songEnd   = -1
+        self.songLoop  = -3
+        self.silence  = 0
+        # durations are multiplied by songSpeed, 2 plays half as fast. a
+        # song that is playing changes tempo from its next note
+        self.songSpeed = 1
+        # songSpeed in 1/256 and the value it was worked out from
+        self.songScale = 256
+        self.songScaleOf = 1
+        # the packed song playing, see compileSong()
+        self.songBuf = array('H', [0])
+        # the .bin song streaming from flash and its ring, see openSong()
+        self.songFile = None
+        self.songRing = None
+        self.Btns = 0
+        self.lastBtns = 0
+        self.songTimer = None
+        # sound effect channel, see sfx()
+        self.sfxTimer = None
+        self.sfxPrio = -1
+        # per frame display stats, see startStats()
+        self.stats = None
+        # phase profiler, see startProfiler()
+        self.prof = None
+        # frame rate governor, see startGovernor()
+        self.gov = None
+        # set by resync(), run() drops the ticks owed for a pause
+        self.resynced = False
+        # True while gameAsync.runAsync() runs the game as uasyncio tasks
+        self.asyncOn = False
+        self.inputPeriod = 10
+        # 1 while record() logs input, 2 while replay() plays it back
+        self.inMode = 0
+        self.inLog = None
+        # True while the timer driven input sampler runs, see startSampler()
+        self.sampling = False
+        # True while pin interrupts queue button events, see startEvents()
+        self.btnEvents = False
+
+    def deinit(self) :
+      # the board's deinit() releases its pins after this
+      self.stopInput()
+      self.stopSampler()
+      self.stopEvents()
+      self.stopSfx()
+      self.songIndex = 0
+      if self.songTimer :
+          self.songTimer.deinit()
+      self.closeSong()
+
+    def getPaddle (self) :
+      if self.inMode :
+          # logged or replayed along with this frame's buttons
+          return self.inPaddle
+      if self.asyncOn :
+          # sampled by inputTask() or sample()
+          return self.paddleNow
+      return self.readPaddle()
+
+    def paddleRange (self, lo, hi, dead=6, smooth=2) :
+      # paddlePos() then returns the paddle filtered and mapped to lo..hi,
+      # see PaddleFilter, g.paddleFilter.moved tells if it changed
+      self.paddleFilter = PaddleFilter(lo, hi, dead, smooth)
+
+    def paddlePos (self) :
+      return self.paddleFilter.update(self.getPaddle())
+
+    def pressed (self,btn) :
+      return (self.Btns & btn)
+
+    def justPressed (self,btn) :
+      return (self.Btns & btn) and not (self.lastBtns & btn)
+
+    def justReleased (self,btn) :
+      return (self.lastBtns & btn) and not (self.Btns & btn)
+
+    def getBtn(self) :
+      self.lastBtns = self.Btns
+      if self.inMode == 2 and self.inLog.read() :
+          return self.Btns
+      if self.btnEvents :
+          # a press caught by btnIrq() since the last frame is latched
+          latch = self.btnLatch
+          self.btnLatch = 0
+          b = self.readBtns()
+          if b != self.evState :
+              self.syncEvents(b)
+          self.Btns = b | latch
+      elif self.asyncOn or self.sampling :
+          # sampled by inputTask() or sample(), a press since the last frame is latched
+          self.Btns = self.btnLatch
+          self.btnLatch = self.btnNow
+      else :
+          self.Btns = self.readBtns()
+      if self.inMode == 1 :
+          self.inLog.write()
+      return self.Btns
+
+    def record(self, path, s=0) :
+      # log the buttons and paddles of every getBtn() frame to path, after
+      # the random seed, so replay() can run the game again the same way.
+      # s fixes the seed, 0 picks one. stopInput() or deinit() writes the
+      # frames still buffered, see gameLog.py
+      from gameLog import InputLog
+      self.stopInput()
+      self.inLog = InputLog(self)
+      self.inLog.record(path, s)
+      self.inMode = 1
+
+    def replay(self, path) :
+      # feed getBtn(), getPaddle() and random() from a record() log, then
+      # carry on with live input once it runs out
+      from gameLog import InputLog
+      self.stopInput()
+      log = InputLog(self)
+      if not log.replay(path) :
+          return False
+      self.inLog = log
+      self.inMode = 2
+      return True
+
+    def stopInput(self) :
+      if self.inMode :
+          self.inMode = 0
+          self.inLog.close()
+          self.inLog = None
+
+    def startSampler(self, period=2) :
+      # the ESP8266 SPI board reads its inputs from a timer, see game8266.py.
+      # elsewhere there is no mux to wait for, this keeps games portable
+      return False
+
+    def stopSampler(self) :
+      pass
+
+    def startEvents(self, size=32) :
+      # button events are for the ESP8266 I2C board, with no events started
+      # nextEvent() has nothing to give
+      return False
+
+    def stopEvents(self) :
+      pass
+
+    def nextEvent(self) :
+      return None
+
+    def  setVol(self) :
+        if self.pressed(self.btnB):
+            if self.justPressed(self.btnU) :
+                self.vol= min (self.vol+1, self.max_vol)
+                self.bgmVol= min (self.bgmVol+1, self.max_vol)
+                self.playTone('c4', 100)
+                return True
+            elif self.justPressed(self.btnD) :
+                self.vol= max (self.vol-1, 0)
+                self.bgmVol= max (self.bgmVol-1, 0)
+                self.playTone('d4', 100)
+                return True
+
+        return False
+
+    def setFrameRate(self) :
+        # R steps the frame rate up, B + R down. one step past either end
+        # is auto (the governor), the next one wraps around
+        if not self.justPressed(self.btnR) :
+            return False
+        down = self.pressed(self.btnB)
+        if self.gov :
+            self.stopGovernor()
+            self.frameRate = 120 if down else 5
+        elif (self.frameRate <= 5) if down else (self.frameRate >= 120) :
+            self.startGovernor()
+        else :
+            self.frameRate += -5 if down else 5
+        self.playTone('f4' if down else 'e4', 100)
+        return True
+
+    def frameRateText(self) :
+        return 'auto' if self.gov else str(self.frameRate)
+
+    def playTone(self, tone, tone_duration, rest_duration=0):
+        if self.sfxTimer :
+            self.sfx(tone, tone_duration, rest_duration)
+            return
+        self.noteOn(self.tones[tone])
+        sleep_ms(tone_duration)
+        self.noteOff()
+        sleep_ms(rest_duration)
+
+    def playSound(self, freq, tone_duration, rest_duration=0):
+        if self.sfxTimer :
+            self.sfx(freq, tone_duration, rest_duration)
+            return
+        self.noteOn(freq)
+        sleep_ms(tone_duration)
+        self.noteOff()
+        sleep_ms(rest_duration)
+
+    def startSfx(self, size=16) :
+        # sound effect channel: sfx() queues notes into a ring of size
+        # (freq, ms) pairs allocated here, a one shot timer plays them back
+        # to back so the game loop never sleeps for a sound. while it runs
+        # playTone() and playSound() queue as well
+        if self.sfxTimer :
+            return
+        self.sfxQueue = array('H', [0] * (size * 2))
+        self.sfxHead = 0
+        self.sfxTail = 0
+        self.sfxPrio = -1
+        self.sfxCb = self.sfxNext
+        self.sfxTimer = Timer(self.sfxTimerId)
+
+    def stopSfx(self) :
+        if self.sfxTimer :
+            self.sfxTimer.deinit()
+            self.sfxTimer = None
+            self.sfxPrio = -1
+            self.noteOff()
+
+    def sfx(self, tone, ms, rest=0, prio=0) :
+        # non blocking, tone is a note name or Hz. sounds of one priority
+        # play in order, a higher priority flushes the queue and plays at
+        # once, a lower one is dropped while a higher one plays. with one
+        # voice the background music is muted meanwhile and comes back at
+        # its next note, with two it goes on. False when the sound was dropped
+        if self.sfxTimer is None :
+            self.startSfx()
+        if prio < self.sfxPrio :
+            return False
+        freq = self.tones[tone] if isinstance(tone, str) else tone
+        if prio == self.sfxPrio :
+            if not self.queueSound(freq, ms, rest) :
+                return False
+            if self.sfxPrio >= 0 :
+                return True
+            # sfxNext() ran dry before the new tail was published and
+            # stopped the timer, start it again. it stays stopped until
+            # then, nothing else can run sfxNext() meanwhile
+            self.sfxPrio = prio
+            self.sfxNext(self.sfxTimer)
+            return True
+        self.sfxTimer.deinit()
+        self.sfxHead = self.sfxTail
+        self.sfxPrio = prio
+        self.queueSound(freq, ms, rest)
+        self.sfxNext(self.sfxTimer)
+        return True
+
+    def queueSound(self, freq, tone_duration, rest_duration=0) :
+        # appends to the sfx() queue, False when it is full
+        q = self.sfxQueue
+        n = len(q)
+        i = self.sfxTail
+        if (self.sfxHead - i - 2) % n < (4 if rest_duration else 2) :
+            return False
+        q[i] = freq
+        q[i + 1] = tone_duration
+        i = i + 2 if i + 2 < n else 0
+        if rest_duration :
+            q[i] = 0
+            q[i + 1] = rest_duration
+            i = i + 2 if i + 2 < n else 0
+        self.sfxTail = i
+        return True
+
+    def sfxNext(self, timer) :
+        # timer callback, starts the next queued note, nothing allocated
+        i = self.sfxHead
+        if i == self.sfxTail :
+            self.noteOff()
+            self.sfxPrio = -1
+            return
+        q = self.sfxQueue
+        self.sfxHead = i + 2 if i + 2 < len(q) else 0
+        if q[i] :
+            self.noteOn(q[i])
+        else :
+            self.noteOff()
+        timer.init(period=q[i + 1], mode=Timer.ONE_SHOT, callback=self.sfxCb)
+
+
+    def compileSong(self, songBuf) :
+        # turn a song list [songStart, notes, timeunit, freq / note,
+        # duration, ..., songLoop or songEnd] into a packed array('H'):
+        # a flags word (1 = loops) then (freq Hz, duration ms) pairs, 0 Hz
+        # a rest. durations are worked out here with timeunit so the
+        # sequencer only indexes integers, songSpeed is applied as it plays
+        if songBuf[0] != self.songStart :
+            return None
+        notes = songBuf[1]
+        unit = songBuf[2]
+        last = len(songBuf) - 1
+        song = array('H', [1 if songBuf[last] == self.songLoop else 0])
+        for i in range(3, last, 2) :
+            f = songBuf[i]
+            song.append(self.tones[f] if notes and f else f)
+            song.append(max(1, int(songBuf[i + 1] * unit)))
+        return song
+
+    def loadSong(self, path) :
+        # a packed song saved by compileSong(), e.g. by host/songc.py
+        with open(path, 'rb') as f :
+            f.seek(0, 2)
+            song = array('H', bytearray(f.tell()))
+            f.seek(0)
+            f.readinto(song)
+        return song
+
+    def handleInterrupt(self,timer):
+        # song timer callback, kept to a single call: the note change runs
+        # in songStep() once the interrupt has returned
+        try :
+            schedule(self.songStepCb, None)
+        except RuntimeError :
+            # schedule queue full, try again in a millisecond
+            timer.init(period=1, mode=Timer.ONE_SHOT, callback=self.songCb)
+
+    def songStep(self, arg) :
+        # plays the next (freq, duration) pair of the packed song, songIndex
+        # 0 means stopped. it plays on voice 1. with a single voice, while a
+        # sound effect has the buzzer notes are skipped, not delayed, so the
+        # song stays in time.
+        # every note ends at songDue, counted from the last one and not
+        # from when this runs, so late callbacks do not add up over a long
+        # song. songLag is how many ms late this note started, songLagMax
+        # the worst so far. more than a note behind the song resyncs
+        free = self.voices > 1 or self.sfxPrio < 0
+        if free :
+            self.noteOff(1) # note has been played long enough, now stop sound
+        song = self.songBuf
+        i = self.songIndex
+        if not i :
+            return
+        if i >= len(song) :
+            if not song[0] & 1 :
+                self.songIndex = 0
+                return
+            i = 1 # repeat from first note
+            if self.songFile :
+                self.songFill(self.songHalf)
+        elif self.songFile and i == self.songHalf :
+            self.songFill(1)
+        if not song[i + 1] :
+            # end of a streamed song
+            self.songIndex = 0
+            self.closeSong()
+            return
+        now = ticks_ms()
+        lag = ticks_diff(now, self.songDue)
+        self.songLag = lag
+        if lag > self.songLagMax :
+            self.songLagMax = lag
+        if song[i] and free :
+            self.noteOn(song[i], 1)
+        if self.songSpeed != self.songScaleOf :
+            self.songScaleOf = self.songSpeed
+            self.songScale = int(self.songSpeed * 256)
+        ms = max(1, song[i + 1] * self.songScale >> 8)
+        due = ticks_add(self.songDue, ms)
+        if ticks_diff(due, now) <= 0 :
+            due = ticks_add(now, ms)
+        self.songDue = due
+        self.songTimer.init(period=ticks_diff(due, now), mode=Timer.ONE_SHOT, callback=self.songCb)
+        self.songIndex = i + 2
+
+    def openSong(self, path, notes=16) :
+        # streams a packed song from flash: the file stays open and songStep()
+        # reads it into a ring of notes (freq, ms) pairs as it plays, one
+        # half while the other half sounds. RAM use does not depend on the
+        # song's length. the ring is reused by the next song
+        self.closeSong()
+        if self.songRing is None or len(self.songRing) != notes * 2 + 1 :
+            self.songRing = array('H', [0] * (notes * 2 + 1))
+            self.songView = memoryview(self.songRing)
+        f = open(path, 'rb')
+        f.readinto(self.songView[0:1])
+        self.songFlags = self.songRing[0]
+        # the ring always wraps, the end of a song is a 0 ms note
+        self.songRing[0] = 1
+        self.songHalf = notes + 1
+        self.songFile = f
+        self.songBuf = self.songRing
+        self.songFill(1)
+        self.songFill(self.songHalf)
+        return self.songRing[2] != 0
+
+    def songFill(self, i) :
+        # reads the notes for one half of the ring starting at index i,
+        # back from the first note at the end of a looping song
+        f = self.songFile
+        end = i + self.songHalf - 1
+        while i < end :
+            n = f.readinto(self.songView[i:end]) >> 1
+            if n :
+                i += n
+            elif self.songFlags & 1 and f.tell() > 2 :
+                f.seek(2)
+            else :
+                self.songBuf[i + 1] = 0
+                return
+
+    def closeSong(self) :
+        if self.songFile :
+            self.songFile.close()
+            self.songFile = None
+
+    def startSong(self, songBuf=None):
+        # songBuf: a song list, a packed array('H') or the path of a .bin,
+        # which is streamed from flash while it plays
+        if self.bgm :
+            self.songIndex = 0
+            if isinstance(songBuf, str) :
+                if not self.openSong(songBuf) :
+                    return False
+                songBuf = None
+            elif songBuf is not None :
+                self.closeSong()
+            elif self.songFile :
+                # the streamed song again, from the top
+                self.songFile.seek(2)
+                self.songFill(1)
+                self.songFill(self.songHalf)
+            if isinstance(songBuf, list) :
+                songBuf = self.compileSong(songBuf)
+                if songBuf is None :
+                    print ("Cannot start Song, Invalid songBuf")
+                    return False
+            if songBuf is not None :
+                self.songBuf = songBuf
+            if len(self.songBuf) < 3 :
+                return False
+            self.songIndex = 1
+            if self.songTimer is None :
+                self.songTimer = Timer(1)
+                self.songCb = self.handleInterrupt
+                self.songStepCb = self.songStep
+            self.songDue = ticks_add(ticks_ms(), 100)
+            self.songLag = 0
+            self.songLagMax = 0
+            self.songTimer.init(period=100 , mode=Timer.ONE_SHOT, callback=self.songCb)
+            return True
+
+    def stopSong(self):
+        self.songIndex = 0
+
+    def random (self, x, y) :
+        return  getrandbits(20) % (y-x+1) + x
+
+    def startStats(self, size=64) :
+        # record the last size frames of display_and_wait() into a FrameStats,
+        # read them back with g.stats.get('show_us') or g.stats.report()
+        from gameStats import FrameStats
+        self.stats = FrameStats(size)
+        self.display.bus_bytes = 0
+        self.display.bus_txns = 0
+        return self.stats
+
+    def stopStats(self) :
+        st = self.stats
+        self.stats = None
+        return st
+
+    def startProfiler(self, chord=0) :
+        # time frame phases, holding chord toggles the overlay. the default,
+        # U + D, can be read off the SPI ladder and is not used in play, on
+        # the ESP32 U and D share one ADC and it is U + L.
+        # game code not split up with g.lap() counts as update
+        from gameProfiler import Profiler
+        self.prof = Profiler(self.display)
+        self.profChord = chord or self.btnU | (self.btnL if self.ESP32 else self.btnD)
+        return self.prof
+
+    def lap(self, phase) :
+        p = self.prof
+        if p :
+            p.lap(phase)
+
+    def profileShow(self, p) :
+        # everything since the last lap is update, then overlay and show()
+        p.lap(LAP_UPDATE)
+        if p.overlay :
+            p.draw()
+        p.begin()
+
+    def startGovernor(self, minRate=10, maxRate=60, size=16) :
+        # pick the frame rate from measured frame cost instead, see Governor.
+        # frameRate reads the rate chosen, targetRate() caps it for the game
+        from gameGovernor import Governor
+        self.gov = Governor(minRate, maxRate, size)
+        self.frameRate = self.gov.rate
+        self.govMark = ticks_us()
+        return self.gov
+
+    def stopGovernor(self) :
+        gov = self.gov
+        self.gov = None
+        return gov
+
+    def targetRate(self, rate) :
+        # the frame rate the game would like, the governor stays at or below
+        # it. a fixed rate the player picked is left alone
+        if self.gov :
+            self.frameRate = self.gov.setTarget(rate)
+
+    def display_and_wait(self) :
+        st = self.stats
+        p = self.prof
+        gov = self.gov
+        if p :
+            self.profileShow(p)
+        if st :
+            t = ticks_us()
+        self.display.show()
+        if st :
+            t = ticks_diff(ticks_us(), t)
+        if p :
+            p.lap(LAP_SHOW)
+            p.frame(self.Btns & self.profChord == self.profChord)
+        if gov :
+            self.frameRate = gov.add(ticks_diff(ticks_us(), self.govMark))
+        timer_dif = int(1000/self.frameRate) - ticks_diff(ticks_ms(), self.displayTimer)
+        if st :
+            d = self.display
+            st.add(d.bus_bytes, d.bus_txns, t, max(timer_dif, 0), max(-timer_dif, 0))
+            d.bus_bytes = 0
+            d.bus_txns = 0
+        if timer_dif > 0 :
+            sleep_ms(timer_dif)
+        self.displayTimer=ticks_ms()
+        if gov :
+            self.govMark = ticks_us()
+        if p :
+            p.begin()
+
+    def run(self, update, draw, tickRate=0, maxSkip=5) :
+        # fixed timestep game loop. update() advances the game by one tick,
+        # tickRate times a second (default frameRate) whatever drawing costs,
+        # and returns True to end the loop. draw() renders the current state
+        # and is followed by show(), it is skipped when the game is behind,
+        # up to maxSkip ticks in a row, then the backlog is dropped.
+        # skippedFrames / drawnFrames count what happened. under the governor
+        # ticks run at tickRate (default the target) and draw() at the rate
+        # the governor picks.
+        self.startTicks(tickRate)
+        while True :
+            n = self.runTicks(update, maxSkip)
+            if n < 0 :
+                return
+            st = self.stats
+            p = self.prof
+            if n :
+                if p :
+                    p.lap(LAP_UPDATE)
+                draw()
+                if p :
+                    p.lap(LAP_DRAW)
+                    self.profileShow(p)
+                if st :
+                    t = ticks_us()
+                self.display.show()
+                if st :
+                    t = ticks_diff(ticks_us(), t)
+                if p :
+                    p.lap(LAP_SHOW)
+                    p.frame(self.Btns & self.profChord == self.profChord)
+                self.frameDone()
+            wait = self.tickWait()
+            if st and n :
+                # overrun here is the game time that went by undrawn
+                d = self.display
+                st.add(d.bus_bytes, d.bus_txns, t, max(wait, 0), (n - 1) * self.tickStep // 1000)
+                d.bus_bytes = 0
+                d.bus_txns = 0
+            if wait > 0 :
+                sleep_ms(wait)
+            if p :
+                p.begin()
+
+    def startTicks(self, tickRate) :
+        # tick accounting for run() and gameAsync.runAsync()
+        gov = self.gov
+        self.tickStep = 1000000 // (tickRate or (gov.target if gov else self.frameRate))
+        self.tickAcc = self.tickStep
+        self.tickLast = self.tickDrawn = ticks_us()
+        self.tickBehind = 0
+        self.skippedFrames = 0
+        self.drawnFrames = 0
+
+    def runTicks(self, update, maxSkip) :
+        # calls update() for the ticks owed since the last call, at most
+        # maxSkip. returns -1 when update() ended the loop, else the ticks a
+        # frame drawn now shows, 0 when none is due
+        step = self.tickStep
+        now = ticks_us()
+        acc = self.tickAcc + ticks_diff(now, self.tickLast)
+        self.tickLast = now
+        n = 0
+        while acc >= step :
+            if update() :
+                return -1
+            acc -= step
+            n += 1
+            if self.resynced :
+                # update() paused on purpose, that time is not owed
+                self.resynced = False
+                acc = 0
+                self.tickLast = ticks_us()
+                break
+            if n >= maxSkip :
+                acc = 0
+                break
+        self.tickAcc = acc
+        n += self.tickBehind
+        gov = self.gov
+        # half a tick of slack so wake up jitter doesn't skip a draw
+        if n and (gov is None or
+                  ticks_diff(now, self.tickDrawn) >= gov.period - (step >> 1)) :
+            self.tickBehind = 0
+            self.skippedFrames += n - 1
+            self.tickDrawn = now
+            return n
+        self.tickBehind = n
+        return 0
+
+    def frameDone(self) :
+        # after the show() of a frame runTicks() asked for
+        gov = self.gov
+        if gov :
+            self.frameRate = gov.add(ticks_diff(ticks_us(), self.tickDrawn))
+        self.drawnFrames += 1
+
+    def tickWait(self) :
+        # ms until the next tick, rounded up, a wait below 1 ms would just spin
+        return (self.tickStep - self.tickAcc - ticks_diff(ticks_us(), self.tickLast) + 999) // 1000
+
+    def resync(self) :
+        # call from update() after a deliberate pause (sleep_ms, a message
+        # shown until a key), run() goes on from now instead of catching up
+        # with the ticks the pause took
+        self.resynced = True
+
+
+class Rect (object):
+    def __init__(self, x, y, w, h):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+
+    def move (self, vx, vy) :
+        self.x = self.x + vx
+        self.y = self.y + vy
+
+
+    def colliderect (self, rect1) :
+      if (self.x + self.w   > rect1.x and
+        self.x < rect1.x + rect1.w  and
+        self.y + self.h > rect1.y and
+        self.y < rect1.y + rect1.h) :
+        return True
+      else:
+        return False
+
+
+class Sprite (object):
+    # sprite sheet in MONO_VLSB, frames are stored one after another,
+    # each frame is ((h + 7) // 8) * w bytes laid out page by page.
+    # mask is optional, same layout, 1 = opaque pixel.
+    # without a mask, pixels of the key colour given to draw_sprite are transparent
+    def __init__(self, data, w, h, frames=1, mask=None):
+        self.width = w
+        self.height = h
+        self.pages = (h + 7) >> 3
+        self.size = self.pages * w
+        self.data = data
+        self.view = memoryview(data)
+        self.frames = self.load(self.view, frames)
+        self.holes = None
+        if mask :
+            # inverted mask, blitted with key 1 it only clears the opaque area
+            hole = bytearray(len(mask))
+            for i in range(len(mask)) :
+                hole[i] = ~mask[i] & 0xff
+            self.holes = self.load(memoryview(hole), frames)
+
+    def load (self, view, frames) :
+        fbs = []
+        for i in range(frames) :
+            fbs.append(framebuf.FrameBuffer(view[i * self.size:(i + 1) * self.size],
+                self.width, self.height, framebuf.MONO_VLSB))
+        return fbs
+
+
+class PaddleFilter (object):
+    # steady integer paddle position for gameESP.paddleRange(). readings
+    # go through an EMA with weight 1 / 2**smooth kept in fixed point, then
+    # a dead-band: the held value only follows once the reading is more
+    # than dead away, so ADC jitter leaves the position alone. the result
+    # is mapped to lo..hi by a scale worked out once, no floats per read.
+    # moved tells whether the last update() changed the position
+    def __init__(self, lo, hi, dead=6, smooth=2, top=1023):
+        self.lo = lo
+        self.hi = hi
+        self.dead = dead
+        self.smooth = smooth
+        self.top = top
+        # 16.16 fixed point rounded up, the dead-band is cut off at either
+        # end so both ends of the range can still be reached
+        span = top - 2 * dead
+        self.scale = (((hi - lo) << 16) + span - 1) // span
+        self.acc = -1
+        self.held = 0
+        self.pos = lo
+        self.moved = False
+
+    def update (self, v) :
+        v = min(max(v, 0), self.top)
+        if self.acc < 0 :
+            self.acc = v << self.smooth
+            self.held = v
+        else :
+            self.acc += v - (self.acc >> self.smooth)
+        e = self.acc >> self.smooth
+        if e > self.held + self.dead :
+            self.held = e - self.dead
+        elif e < self.held - self.dead :
+            self.held = e + self.dead
+        pos = self.lo + ((max(self.held - self.dead, 0) * self.scale) >> 16)
+        if pos > self.hi :
+            pos = self.hi
+        self.moved = pos != self.pos
+        self.pos = pos
+        return pos
@@ -0,0 +1,76 @@
+# gameGovernor.py
+#
+# the frame rate governor of gameESP.startGovernor(), imported by it
+#
+from array import array
+
+
+class Governor (object):
+    # picks the frame rate the board can keep up with, for
+    # gameESP.startGovernor(). add() gets what each frame cost without the
+    # sleep, in us, and keeps the last size frames. the rate is the highest
+    # one in steps of step between minRate and maxRate, and not above the
+    # game's target, whose budget covers the average cost plus a quarter.
+    # it climbs one step per full window and drops at once when frames
+    # overrun twice in a row, a single slow frame (gc) is not a trend.
+    def __init__(self, minRate=10, maxRate=60, size=16, step=5):
+        self.minRate = minRate
+        self.maxRate = maxRate
+        self.step = step
+        self.size = size
+        self.cost = array('l', [0] * size)
+        self.target = maxRate
+        self.reset(maxRate)
+
+    def reset (self, rate) :
+        for i in range(self.size) :
+            self.cost[i] = 0
+        self.total = 0
+        self.pos = 0
+        self.count = 0
+        self.since = 0
+        self.overruns = 0
+        self.setRate(rate)
+
+    def setRate (self, rate) :
+        self.rate = max(self.minRate, min(rate, self.target, self.maxRate))
+        self.period = 1000000 // self.rate
+        return self.rate
+
+    def setTarget (self, rate) :
+        self.target = rate
+        if self.rate > rate :
+            self.setRate(rate)
+        return self.rate
+
+    def fit (self, cost) :
+        # highest rate whose budget covers cost plus headroom
+        r = 1000000 // (cost + (cost >> 2) + 1)
+        return self.setRate(r - r % self.step)
+
+    def add (self, cost) :
+        c = self.cost
+        i = self.pos
+        self.total += cost - c[i]
+        c[i] = cost
+        self.pos = i + 1 if i + 1 < self.size else 0
+        if self.count < self.size :
+            self.count += 1
+        self.since += 1
+        rate = self.rate
+        if cost > self.period :
+            self.overruns += 1
+            if self.overruns >= 2 :
+                self.overruns = 0
+                self.since = 0
+                self.fit(cost)
+                if self.rate >= rate :
+                    self.setRate(rate - self.step)
+            return self.rate
+        self.overruns = 0
+        if self.since >= self.size :
+            self.since = 0
+            self.fit(self.total // self.count)
+            if self.rate > rate + self.step :
+                self.setRate(rate + self.step)
+        return self.rate
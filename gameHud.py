@@ -0,0 +1,83 @@
+# gameHud.py
+#
+# numeric HUD fields for games on game8266.py and game32.py, imported only
+# by the games that draw one
+#
+#       from gameHud import Hud
+#       hud = Hud(g.display)
+#       hudScore = hud.add('S:', 0, 0, 4)
+#
+from array import array
+import framebuf
+
+
+class Hud (object):
+    # numeric HUD fields (score, level, lives...) drawn from a glyph cache.
+    # digits 0-9 are rendered once into 8x8 frame buffers, set() only
+    # redraws a field when its value changes, by blitting cached digits,
+    # so an unchanged HUD costs nothing and a changed one allocates nothing.
+    # the game must not clear the HUD area every frame, call draw() after
+    # clearing the whole screen to repaint all fields.
+    def __init__(self, display):
+        self.display = display
+        # digits 0-9 then a blank cell, 8 bytes each
+        glyphs = bytearray(88)
+        framebuf.FrameBuffer(glyphs, 88, 8, framebuf.MONO_VLSB).text('0123456789', 0, 0, 1)
+        view = memoryview(glyphs)
+        self.glyphs = []
+        for i in range(11) :
+            self.glyphs.append(framebuf.FrameBuffer(view[i * 8:i * 8 + 8], 8, 8, framebuf.MONO_VLSB))
+        self.labels = []
+        self.xs = bytearray(0)
+        self.ys = bytearray(0)
+        self.sizes = bytearray(0)
+        self.values = array('l')
+        self.digits = bytearray(10)
+
+    def add (self, label, x, y, size=5) :
+        # label drawn at x, y followed by size digits, returns the field id
+        self.labels.append(label)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.sizes.append(size)
+        self.values.append(0)
+        i = len(self.labels) - 1
+        self.drawField(i)
+        return i
+
+    def set (self, i, v) :
+        if self.values[i] != v :
+            self.values[i] = v
+            self.render(i)
+
+    def get (self, i) :
+        return self.values[i]
+
+    def draw (self) :
+        for i in range(len(self.labels)) :
+            self.drawField(i)
+
+    def drawField (self, i) :
+        self.display.text(self.labels[i], self.xs[i], self.ys[i], 1)
+        self.render(i)
+
+    def render (self, i) :
+        d = self.display
+        n = self.sizes[i]
+        x = self.xs[i] + (len(self.labels[i]) << 3)
+        y = self.ys[i]
+        digits = self.digits
+        # split into digits from the right, then draw left aligned. a
+        # value too wide for the field shows as all 9s
+        v = min(max(self.values[i], 0), 10 ** n - 1)
+        k = n
+        while k :
+            k -= 1
+            digits[k] = v % 10
+            v //= 10
+            if not v :
+                break
+        for j in range(n) :
+            c = digits[k + j] if k + j < n else 10
+            d.blit_raw(self.glyphs[c], x + (j << 3), y)
+        d.mark(x, y, n << 3, 8)
@@ -0,0 +1,70 @@
+# gameLadder.py
+#
+# the button ladder of the ESP8266 SPI board, imported by game8266.py when
+# useSPI is set. btntest.py calibrates it
+#
+from array import array
+
+
+class ButtonLadder (object):
+    # decodes the resistor ladder the SPI board reads its buttons through.
+    # table holds (highest ADC value, buttons) pairs sorted by value, one
+    # per combination the ladder can tell apart, the last one open ended.
+    # buckets maps adc >> 4 to the first pair that can match, so decode()
+    # costs a lookup plus a step when a bucket straddles a boundary.
+    # calibrate() builds the table from readings of each combination,
+    # btntest.py walks through them and save()s the result to flash.
+    FILE = 'btncal.dat'
+    # U 2, L 4, R 8, D 16, A 32, B 64
+    DEFAULT = (68, 0, 176, 2, 241, 18, 277, 4, 361, 34, 443, 8, 485, 36,
+               531, 66, 569, 16, 615, 40, 660, 48, 683, 68, 736, 32,
+               805, 72, 840, 80, 870, 96, 0xffff, 64)
+
+    def __init__(self, table=None):
+        self.buckets = bytearray(64)
+        self.set(table or self.DEFAULT)
+
+    def set (self, table) :
+        t = array('H', table)
+        b = self.buckets
+        i = 0
+        for k in range(64) :
+            while t[i] < k << 4 :
+                i += 2
+            b[k] = i
+        self.table = t
+
+    def decode (self, a0) :
+        t = self.table
+        i = self.buckets[a0 >> 4 if a0 < 1024 else 63]
+        while a0 > t[i] :
+            i += 2
+        return t[i + 1]
+
+    def calibrate (self, readings) :
+        # readings: (adc, buttons) for each combination, nothing pressed
+        # included. boundaries go half way between neighbouring readings
+        r = sorted(readings)
+        t = []
+        for i in range(len(r) - 1) :
+            t.append((r[i][0] + r[i + 1][0]) >> 1)
+            t.append(r[i][1])
+        t.append(0xffff)
+        t.append(r[-1][1])
+        self.set(t)
+
+    def load (self, path=FILE) :
+        # keeps the current table if the file is missing or not a table
+        try :
+            with open(path, 'rb') as f :
+                t = array('H', f.read())
+        except OSError :
+            return False
+        if len(t) < 2 or len(t) & 1 or t[-2] != 0xffff :
+            return False
+        self.set(t)
+        return True
+
+    def save (self, path=FILE) :
+        with open(path, 'wb') as f :
+            f.write(self.table)
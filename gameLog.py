@@ -0,0 +1,92 @@
+# gameLog.py
+#
+# the input log of gameESP.record() and gameESP.replay(), imported by them.
+# a log starts with b'GI', the bytes per frame and the random seed, then
+# per getBtn() frame: 1 byte buttons, 2 bytes a paddle, 2 more for the
+# second paddle of the ESP8266 SPI board
+#
+from utime import ticks_us
+from random import seed
+
+
+class InputLog (object):
+    # frames go through a 64 frame buffer, so the file is touched once
+    # every 64 frames. getPaddle() and getPaddle2() return g.inPaddle and
+    # g.inPaddle2, logged or replayed along with the frame's buttons
+    def __init__(self, g):
+        self.g = g
+
+    def record (self, path, s=0) :
+        g = self.g
+        s = s or ticks_us() & 0x7fffffff
+        seed(s)
+        self.width = 5 if g.paddle2 else 3
+        self.buf = bytearray(self.width * 64)
+        self.pos = 0
+        self.file = open(path, 'wb')
+        self.file.write(b'GI' + bytes((self.width,)) + s.to_bytes(4, 'little'))
+        # what getPaddle() returns until the first getBtn() frame, the same
+        # when recording and replaying so the runs stay identical
+        g.inPaddle = g.inPaddle2 = 0
+        self.recording = True
+
+    def replay (self, path) :
+        g = self.g
+        f = open(path, 'rb')
+        head = f.read(7)
+        if head[:2] != b'GI' :
+            f.close()
+            print ("Cannot replay, not an input log")
+            return False
+        self.width = head[2]
+        seed(int.from_bytes(head[3:7], 'little'))
+        self.buf = bytearray(self.width * 64)
+        self.pos = self.len = 0
+        self.file = f
+        g.inPaddle = g.inPaddle2 = 0
+        self.recording = False
+        return True
+
+    def close (self) :
+        # writes the frames still buffered when recording
+        if self.recording :
+            self.file.write(memoryview(self.buf)[:self.pos])
+        self.file.close()
+
+    def write (self) :
+        # log g.Btns and the paddles of this frame
+        g = self.g
+        b = self.buf
+        i = self.pos
+        b[i] = g.Btns
+        p = g.inPaddle = g.paddleNow if g.asyncOn else g.readPaddle()
+        b[i + 1] = p & 0xff
+        b[i + 2] = p >> 8
+        if self.width == 5 :
+            p = g.inPaddle2 = g.readPaddle2()
+            b[i + 3] = p & 0xff
+            b[i + 4] = p >> 8
+        i += self.width
+        if i == len(b) :
+            self.file.write(b)
+            i = 0
+        self.pos = i
+
+    def read (self) :
+        # set g.Btns and the paddles from the next frame, False once the
+        # log runs out, which stops the replay
+        g = self.g
+        b = self.buf
+        i = self.pos
+        if i >= self.len :
+            i = 0
+            self.len = self.file.readinto(b)
+            if not self.len :
+                g.stopInput()
+                return False
+        g.Btns = b[i]
+        g.inPaddle = b[i + 1] | b[i + 2] << 8
+        if self.width == 5 :
+            g.inPaddle2 = b[i + 3] | b[i + 4] << 8
+        self.pos = i + self.width
+        return True
@@ -0,0 +1,69 @@
+# gameProfiler.py
+#
+# the frame phase profiler of gameESP.startProfiler(), imported by it.
+# the phases are the LAP_ constants of gameESP
+#
+from utime import ticks_us, ticks_diff
+from array import array
+
+
+class Profiler (object):
+    # time spent in each phase of a frame, in preallocated counters.
+    # lap(phase) charges the time since the previous lap to phase, so a game
+    # calls g.lap() at the end of each phase it wants to see, the rest is
+    # charged by display_and_wait() / run(). once a second the totals turn
+    # into per frame averages in us plus fps, which draw() overlays on the
+    # screen. gameESP toggles the overlay with a button chord.
+    NAMES = ('in ', 'upd', 'col', 'drw', 'shw')
+
+    def __init__(self, display):
+        self.display = display
+        self.total = array('l', [0] * 5)
+        self.avg = array('l', [0] * 5)
+        self.fps = 0
+        self.frames = 0
+        self.overlay = False
+        self.held = False
+        self.hud = None
+        self.start = self.mark = ticks_us()
+
+    def begin (self) :
+        # restart the lap timer without charging anything, e.g. after a sleep
+        self.mark = ticks_us()
+
+    def lap (self, phase) :
+        t = ticks_us()
+        self.total[phase] += ticks_diff(t, self.mark)
+        self.mark = t
+
+    def frame (self, chordHeld) :
+        if chordHeld and not self.held :
+            self.overlay = not self.overlay
+        self.held = chordHeld
+        self.frames += 1
+        now = ticks_us()
+        dt = ticks_diff(now, self.start)
+        if dt >= 1000000 :
+            f = self.frames
+            for i in range(5) :
+                self.avg[i] = self.total[i] // f
+                self.total[i] = 0
+            self.fps = f * 1000000 // dt
+            self.frames = 0
+            self.start = now
+            # the overlay off, the game owns that part of the screen
+            if self.hud and self.overlay :
+                for i in range(5) :
+                    self.hud.set(i, self.avg[i])
+                self.hud.set(5, self.fps)
+
+    def draw (self) :
+        # us per frame for each phase and fps, right half of pages 1-6
+        if self.hud is None :
+            from gameHud import Hud
+            self.hud = Hud(self.display)
+            for i in range(5) :
+                self.hud.add(self.NAMES[i], 64, 8 + (i << 3), 5)
+            self.hud.add('fps', 64, 48, 5)
+        self.display.fill_rect(64, 8, 64, 48, 0)
+        self.hud.draw()
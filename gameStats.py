@@ -0,0 +1,57 @@
+# gameStats.py
+#
+# the per frame display stats of gameESP.startStats(), imported by it
+#
+from array import array
+
+
+class FrameStats (object):
+    # per frame display cost in a fixed ring buffer of the last size frames,
+    # filled by gameESP.display_and_wait() after g.startStats().
+    # one row of FIELDS per frame, nothing is allocated per frame.
+    # bytes / txns: display bus traffic, show_us: time spent in show(),
+    # slept_ms: time left in the frame budget, overrun_ms: time over it
+    FIELDS = ('bytes', 'txns', 'show_us', 'slept_ms', 'overrun_ms')
+
+    def __init__(self, size=64):
+        self.size = size
+        self.data = array('l', [0] * (size * 5))
+        self.reset()
+
+    def reset (self) :
+        self.count = 0
+        self.pos = 0
+
+    def add (self, nbytes, txns, show_us, slept, overrun) :
+        d = self.data
+        i = self.pos * 5
+        d[i] = nbytes
+        d[i + 1] = txns
+        d[i + 2] = show_us
+        d[i + 3] = slept
+        d[i + 4] = overrun
+        self.pos = self.pos + 1 if self.pos + 1 < self.size else 0
+        self.count += 1
+
+    def get (self, field) :
+        # min, avg, max of a field (name or index) over the buffered frames
+        f = self.FIELDS.index(field) if isinstance(field, str) else field
+        n = min(self.count, self.size)
+        if not n :
+            return 0, 0, 0
+        d = self.data
+        lo = hi = total = d[f]
+        for i in range(f + 5, n * 5, 5) :
+            v = d[i]
+            total += v
+            if v < lo :
+                lo = v
+            elif v > hi :
+                hi = v
+        return lo, total // n, hi
+
+    def report (self) :
+        print('frames', min(self.count, self.size), '  min / avg / max')
+        for f in range(5) :
+            lo, avg, hi = self.get(f)
+            print('{:<11}{:>7}{:>7}{:>7}'.format(self.FIELDS[f], lo, avg, hi))
@@ -0,0 +1,79 @@
+# gameTileMap.py
+#
+# page aligned 8x8 tile maps for game8266.py and game32.py, imported only
+# by the games that draw one
+#
+#       from gameTileMap import TileMap
+#
+from array import array
+
+
+class TileMap (object):
+    # page aligned map of 8x8 tiles drawn straight into the display buffer.
+    # bank holds 8 bytes per tile, one MONO_VLSB byte per column.
+    # tiles holds one tile index per cell, dirty one bit per cell for each
+    # row, so draw() only copies cells changed since the last draw().
+    # up to 16 columns (128 pixels) per row.
+    def __init__(self, display, bank, cols, rows, x=0, page=0):
+        self.display = display
+        self.bank = memoryview(bank)
+        self.cols = cols
+        self.rows = rows
+        self.x = x
+        self.page = page
+        self.tiles = bytearray(cols * rows)
+        self.dirty = array('H', bytearray(2 * rows))
+        self.invalidate()
+
+    def set (self, c, r, t) :
+        i = r * self.cols + c
+        if self.tiles[i] != t :
+            self.tiles[i] = t
+            self.dirty[r] |= 1 << c
+
+    def get (self, c, r) :
+        return self.tiles[r * self.cols + c]
+
+    def tileAt (self, x, y) :
+        # tile under screen pixel x, y, or -1 outside the map
+        c = (x - self.x) >> 3
+        r = (y >> 3) - self.page
+        if 0 <= c < self.cols and 0 <= r < self.rows and x >= self.x :
+            return self.tiles[r * self.cols + c]
+        return -1
+
+    def fill (self, t) :
+        for r in range(self.rows) :
+            for c in range(self.cols) :
+                self.set(c, r, t)
+
+    def invalidate (self) :
+        m = (1 << self.cols) - 1
+        for r in range(self.rows) :
+            self.dirty[r] = m
+
+    def draw (self) :
+        d = self.display
+        buf = d.buffer
+        bank = self.bank
+        tiles = self.tiles
+        dirty = self.dirty
+        for r in range(self.rows) :
+            bits = dirty[r]
+            if not bits :
+                continue
+            dirty[r] = 0
+            o = (self.page + r) * d.width + self.x
+            i = r * self.cols
+            c = 0
+            lo = -1
+            while bits :
+                if bits & 1 :
+                    t = tiles[i + c] << 3
+                    buf[o + (c << 3):o + (c << 3) + 8] = bank[t:t + 8]
+                    if lo < 0 :
+                        lo = c
+                    hi = c
+                bits >>= 1
+                c += 1
+            d.mark(self.x + (lo << 3), (self.page + r) << 3, (hi - lo + 1) << 3, 8)
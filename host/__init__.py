@@ -0,0 +1,70 @@
+"""
+Host-side stand-ins for the MicroPython modules used by gameESP.
+
+install() registers the fakes in sys.modules so game8266.py, game32.py and
+the games can be imported and run unmodified under CPython. See run.py for
+the emulator entry point and bench_display.py for the bus benchmark.
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _gc_shim():
+    import gc
+    mod = types.ModuleType('gc')
+    for name in ('collect', 'enable', 'disable', 'isenabled'):
+        setattr(mod, name, getattr(gc, name))
+    mod.mem_free = lambda: 100000
+    mod.mem_alloc = lambda: 0
+    mod.threshold = lambda *a: -1
+    return mod
+
+
+def _network_shim():
+    mod = types.ModuleType('network')
+
+    class WLAN:
+        def __init__(self, *a):
+            pass
+
+        def active(self, *a):
+            return False
+
+        def isconnected(self):
+            return False
+
+    mod.WLAN = WLAN
+    mod.STA_IF, mod.AP_IF = 0, 1
+    return mod
+
+
+def _ilistdir(path='.'):
+    for name in sorted(os.listdir(path)):
+        full = os.path.join(path, name)
+        yield (name, 0x4000 if os.path.isdir(full) else 0x8000, 0)
+
+
+def install():
+    from . import framebuf, machine, micropython, uasyncio, utime
+    sys.modules['framebuf'] = framebuf
+    sys.modules['machine'] = machine
+    sys.modules['micropython'] = micropython
+    sys.modules['utime'] = utime
+    sys.modules['uasyncio'] = uasyncio
+    sys.modules['gc'] = _gc_shim()
+    sys.modules['network'] = _network_shim()
+    if not hasattr(os, 'ilistdir'):
+        os.ilistdir = _ilistdir
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+
+def load_game(board='8266'):
+    # import game8266.py or game32.py on top of the fakes
+    install()
+    import importlib
+    return importlib.import_module('game' + board)
@@ -0,0 +1,101 @@
+"""
+Bus traffic benchmark for the SSD1306 driver in game8266.py / game32.py.
+
+    python -m host.bench_display [frames]
+
+Runs the same frames through the original flush (one bus transaction per
+command byte, full 1 KB frame on every show) and through the current
+driver (batched commands, dirty windows), on a fake SPI and a fake I2C
+bus, and prints transactions, bytes on the bus, estimated wire time and
+host time per frame.
+"""
+
+import sys
+import time
+
+from . import load_game
+
+SPI_HZ = 8000000     # game8266 SPI clock
+I2C_HZ = 400000
+
+
+def legacy_show(d):
+    # the flush as it was before batching and dirty tracking
+    for cmd in (0x21, 0, d.width - 1, 0x22, 0, d.pages - 1):
+        if hasattr(d, 'spi'):
+            d.spi.init(baudrate=d.rate, polarity=0, phase=0)
+            d.dc(0)
+            d.spi.write(bytearray([cmd]))
+        else:
+            d.i2c.writeto(d.addr, bytearray([0x80, cmd]))
+    if hasattr(d, 'spi'):
+        d.spi.init(baudrate=d.rate, polarity=0, phase=0)
+        d.dc(1)
+        d.spi.write(d.buffer)
+    else:
+        d.i2c.writevto(d.addr, [b'\x40', d.buffer])
+    d.clean()
+
+
+def scene_full(d, n):
+    # invader style, clear and redraw everything every frame
+    d.fill(0)
+    for r in range(5):
+        for c in range(11):
+            d.fill_rect(5 + c * 6 + n % 4, 10 + r * 6, 4, 4, 1)
+    d.fill_rect(60, 58, 5, 5, 1)
+
+
+def scene_ball(d, n):
+    # breakout style, erase and draw a ball, score changes now and then
+    x = 10 + n % 100
+    y = 20 + (n * 3) % 30
+    d.fill_rect(x - 1, y - 1, 2, 2, 0)
+    d.fill_rect(x, y, 2, 2, 1)
+    if n % 10 == 0:
+        d.fill_rect(25, 0, 20, 8, 0)
+        d.text(str(n // 10), 25, 0, 1)
+
+
+def run(g, bus, scene, legacy, frames):
+    m = sys.modules['machine']
+    if bus == 'spi':
+        port = m.SPI(1, baudrate=SPI_HZ)
+        d = g.SSD1306_SPI(128, 64, port, m.Pin(2), m.Pin(16))
+    else:
+        port = m.I2C(-1, m.Pin(5), m.Pin(4))
+        d = g.SSD1306_I2C(128, 64, port)
+    port.txns = port.nbytes = 0
+    host = 0
+    for n in range(frames):
+        scene(d, n)
+        t = time.perf_counter()
+        if legacy:
+            legacy_show(d)
+        else:
+            d.show()
+        host += time.perf_counter() - t
+    txns = port.txns / frames
+    nbytes = port.nbytes / frames
+    if bus == 'spi':
+        wire = nbytes * 8 * 1e6 / SPI_HZ
+    else:
+        # 9 bits per byte plus start and stop per transaction
+        wire = (nbytes * 9 + txns * 2) * 1e6 / I2C_HZ
+    return txns, nbytes, wire, host * 1e6 / frames
+
+
+def main(frames=200):
+    g = load_game('8266')
+    print('%-5s %-5s %-8s %8s %8s %10s %10s' %
+          ('bus', 'scene', 'path', 'txn/f', 'byte/f', 'wire us/f', 'host us/f'))
+    for bus in ('spi', 'i2c'):
+        for name, scene in (('full', scene_full), ('ball', scene_ball)):
+            for legacy in (True, False):
+                r = run(g, bus, scene, legacy, frames)
+                print('%-5s %-5s %-8s %8.1f %8.1f %10.1f %10.1f' %
+                      ((bus, name, 'old' if legacy else 'new') + r))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
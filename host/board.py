@@ -0,0 +1,79 @@
+"""
+Board wiring for the host emulator.
+
+A Pad holds the buttons and paddles a player (or a script) is pressing.
+Board turns it into the pin levels and ADC readings gameESP expects on
+each layout, and attaches a Panel to the display bus.
+"""
+
+from . import machine
+from .machine import ADC, Pin
+
+U, L, R, D, A, B = 1 << 1, 1 << 2, 1 << 3, 1 << 4, 1 << 5, 1 << 6
+NAMES = {'U': U, 'L': L, 'R': R, 'D': D, 'A': A, 'B': B}
+
+# ADC(0) reading on the 8266 SPI board for each combination the resistor
+# ladder can tell apart, mid way between getBtn()'s thresholds
+LADDER = {
+    0: 20, U: 120, U | D: 210, L: 260, U | A: 320, R: 400, L | A: 465,
+    U | B: 510, D: 550, R | A: 590, D | A: 640, L | B: 672, A: 710,
+    R | B: 770, D | B: 820, A | B: 855, B: 900,
+}
+
+BOARDS = ('8266spi', '8266i2c', '32')
+
+
+def parse_buttons(s):
+    m = 0
+    for ch in s.upper():
+        m |= NAMES.get(ch, 0)
+    return m
+
+
+class Pad:
+    def __init__(self):
+        self.btns = 0
+        self.paddle = 512       # 0..1023 like getPaddle() on the 8266
+        self.paddle2 = 512
+
+
+def ladder(btns):
+    if btns in LADDER:
+        return LADDER[btns]
+    # the ladder reads one direction and one of A / B at most
+    ab = btns & A or btns & B
+    for d in (U, L, R, D):
+        if btns & d:
+            return LADDER.get(d | ab, LADDER[d])
+    return LADDER[ab]
+
+
+class Board:
+    def __init__(self, name, pad, panel):
+        self.name = name
+        self.pad = pad
+        self.panel = panel
+        lv = machine._levels
+        if name == '8266spi':
+            # ADC(0) reads the ladder, paddle or paddle 2 depending on the mux pins
+            ADC.sources[0] = lambda: (ladder(pad.btns) if lv.get(5) else
+                                      pad.paddle if lv.get(4) else
+                                      pad.paddle2 if lv.get(0) else 0)
+            panel.attach_spi(dc_pin=2)
+            self.pins = {}
+        elif name == '8266i2c':
+            ADC.sources[0] = lambda: pad.paddle
+            panel.attach_i2c()
+            self.pins = {12: L, 13: R, 14: U, 2: D, 0: A, 16: B}
+        else:
+            ADC.sources[34] = lambda: 3000 if pad.btns & L else 1750 if pad.btns & R else 0
+            ADC.sources[35] = lambda: 3000 if pad.btns & U else 1750 if pad.btns & D else 0
+            ADC.sources[39] = lambda: int((pad.paddle + 48) * 2.935)
+            panel.attach_spi(dc_pin=21)
+            self.pins = {32: A, 33: B}
+        self.apply()
+
+    def apply(self):
+        # buttons pull their pin to ground when pressed
+        for pin, bit in self.pins.items():
+            Pin.drive(pin, 0 if self.pad.btns & bit else 1)
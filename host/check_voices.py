@@ -0,0 +1,51 @@
+"""
+Check that notes are played on gameESP's persistent PWM voices.
+
+    python -m host.check_voices
+
+For game8266.py and game32.py: plays a looping song, a burst of sfx()
+at rising priorities and a few blocking playTone() calls, then compares
+the PWM objects constructed and the PWM changes logged by the fake
+machine module. Every note must retune beeper / beeper2, none may
+construct a PWM. Exits non-zero when one did.
+"""
+
+import sys
+
+from . import load_game
+
+
+def check(board):
+    g = load_game(board)
+    m = sys.modules['machine']
+    utime = sys.modules['utime']
+    game = g.gameESP()
+    created = m.PWM.created
+    m.PWM.log.clear()
+    game.startSong('bgm1.bin')
+    utime.advance_us(2000000)
+    for prio in (0, 0, 1, 0, 2):
+        for tone in ('c4', 'e4', 'g4'):
+            game.sfx(tone, 40, 10, prio)
+        utime.advance_us(100000)
+    utime.advance_us(2000000)
+    game.stopSfx()
+    game.stopSong()
+    for tone in ('c5', 'd5', 'e5'):
+        game.playTone(tone, 20, 5)
+    game.deinit()
+    notes = len(m.PWM.log)
+    new = m.PWM.created - created
+    print('game%-5s %5d PWM changes, %d PWM objects created' % (board, notes, new))
+    return new == 0 and notes > 0
+
+
+def main():
+    ok = True
+    for board in ('8266', '32'):
+        ok = check(board) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
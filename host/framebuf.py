@@ -0,0 +1,133 @@
+"""
+Host stand-in for framebuf, MONO_VLSB only.
+
+Text uses the 5x7 Adafruit font from utils/lcd/glcdfont.py in 8x8 cells,
+the firmware's own 8x8 font differs slightly in glyph shapes.
+"""
+
+import importlib.util
+import os
+
+MONO_VLSB = 0
+
+_font = None
+
+
+def _glyphs():
+    global _font
+    if _font is None:
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'utils', 'lcd', 'glcdfont.py')
+        spec = importlib.util.spec_from_file_location('_glcdfont', path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _font = mod._font
+    return _font
+
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, fmt, stride=None):
+        if fmt != MONO_VLSB:
+            raise ValueError('only MONO_VLSB is supported')
+        self._buf = buf
+        self._w = width
+        self._h = height
+        self._stride = stride or width
+
+    def fill(self, c):
+        v = 0xff if c else 0
+        for i in range(((self._h + 7) >> 3) * self._stride):
+            self._buf[i] = v
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._w and 0 <= y < self._h):
+            return None
+        i = (y >> 3) * self._stride + x
+        m = 1 << (y & 7)
+        if c is None:
+            return 1 if self._buf[i] & m else 0
+        if c:
+            self._buf[i] |= m
+        else:
+            self._buf[i] &= ~m & 0xff
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        x1 = min(x + w, self._w)
+        y0 = max(y, 0)
+        y1 = min(y + h, self._h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        buf = self._buf
+        for p in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+            top = max(y0, p << 3) & 7
+            bot = min(y1, (p + 1) << 3) - (p << 3)
+            m = ((0xff << top) & 0xff) & (0xff >> (8 - bot))
+            o = p * self._stride
+            if c:
+                for i in range(o + x0, o + x1):
+                    buf[i] |= m
+            else:
+                n = ~m & 0xff
+                for i in range(o + x0, o + x1):
+                    buf[i] &= n
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def text(self, s, x, y, c=1):
+        font = _glyphs()
+        for ch in s:
+            o = (ord(ch) & 0xff) * 5
+            for col in range(5):
+                bits = font[o + col]
+                for row in range(8):
+                    if bits & (1 << row):
+                        self.pixel(x + col, y + row, c)
+            x += 8
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for yy in range(fbuf._h):
+            for xx in range(fbuf._w):
+                c = fbuf.pixel(xx, yy)
+                if c != key:
+                    self.pixel(x + xx, y + yy, c)
+
+    def scroll(self, dx, dy):
+        w, h = self._w, self._h
+        old = [[self.pixel(x, y) for x in range(w)] for y in range(h)]
+        for y in range(h):
+            for x in range(w):
+                sx, sy = x - dx, y - dy
+                if 0 <= sx < w and 0 <= sy < h:
+                    self.pixel(x, y, old[sy][sx])
@@ -0,0 +1,252 @@
+"""
+Host stand-in for machine.
+
+Pins share their level by pin number, so the board wiring in host/board.py
+can drive inputs and watch outputs. SPI and I2C count the transactions and
+bytes they carry and pass them to an optional listener (the panel model),
+the time the bytes take on the wire moves the virtual clock on.
+PWM logs every note, Timer runs on the virtual clock in host/utime.py.
+"""
+
+from . import utime
+
+_levels = {}        # pin number -> level
+_irqs = {}          # pin number -> (trigger, handler, pin)
+
+
+def idle():
+    utime.run_timers()
+
+
+def freq(f=None):
+    return 160000000
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if value is not None:
+            _levels[self.id] = 1 if value else 0
+        elif pull == Pin.PULL_UP and self.id not in _levels:
+            _levels[self.id] = 1
+
+    def value(self, v=None):
+        if v is None:
+            return _levels.get(self.id, 0)
+        _levels[self.id] = 1 if v else 0
+
+    __call__ = value
+
+    def on(self):
+        _levels[self.id] = 1
+
+    def off(self):
+        _levels[self.id] = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, **kw):
+        if handler is None:
+            _irqs.pop(self.id, None)
+        else:
+            _irqs[self.id] = (trigger, handler, self)
+
+    @staticmethod
+    def drive(id, level):
+        # external signal on an input pin, fires its irq on an edge
+        old = _levels.get(id, 0)
+        _levels[id] = level
+        if id in _irqs and old != level:
+            trigger, handler, pin = _irqs[id]
+            if trigger & (Pin.IRQ_RISING if level else Pin.IRQ_FALLING):
+                handler(pin)
+
+
+class SPI:
+    listener = None     # called with (spi, bytes) on every write
+
+    def __init__(self, id, baudrate=1000000, **kw):
+        self.id = id
+        self.baudrate = baudrate
+        self.txns = 0
+        self.nbytes = 0
+        self.inits = 0
+
+    def init(self, baudrate=None, **kw):
+        if baudrate:
+            self.baudrate = baudrate
+        self.inits += 1
+
+    def write(self, buf):
+        self.txns += 1
+        self.nbytes += len(buf)
+        if SPI.listener:
+            SPI.listener(self, bytes(buf))
+        utime.advance_us(len(buf) * 8000000 // self.baudrate)
+
+    def deinit(self):
+        pass
+
+
+class I2C:
+    listener = None     # called with (i2c, addr, bytes) on every write
+
+    def __init__(self, id=-1, scl=None, sda=None, freq=400000):
+        self.freq = freq
+        self.txns = 0
+        self.nbytes = 0
+
+    def writeto(self, addr, buf, stop=True):
+        # the address byte goes on the wire too
+        self.txns += 1
+        self.nbytes += 1 + len(buf)
+        if I2C.listener:
+            I2C.listener(self, addr, bytes(buf))
+        self._wire(1 + len(buf))
+
+    def writevto(self, addr, bufs, stop=True):
+        data = b''.join(bytes(b) for b in bufs)
+        self.txns += 1
+        self.nbytes += 1 + len(data)
+        if I2C.listener:
+            I2C.listener(self, addr, data)
+        self._wire(1 + len(data))
+
+    def _wire(self, n):
+        # 9 clocks a byte with the ack
+        utime.advance_us(n * 9000000 // self.freq)
+
+    def scan(self):
+        return [0x3c]
+
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+    WIDTH_12BIT = 3
+    sources = {}        # channel -> callable returning the reading
+
+    def __init__(self, id):
+        self.id = id.id if isinstance(id, Pin) else id
+
+    def atten(self, a):
+        pass
+
+    def width(self, w):
+        pass
+
+    def read(self):
+        src = ADC.sources.get(self.id)
+        return int(src()) if src else 0
+
+    def read_u16(self):
+        return self.read() << 6
+
+    def deinit(self):
+        pass
+
+
+class DAC:
+    def __init__(self, pin):
+        self.pin = pin
+        self.writes = 0
+        self.last = 0
+
+    def write(self, v):
+        self.writes += 1
+        self.last = v
+
+
+class PWM:
+    created = 0         # PWM objects constructed so far
+    log = []            # (ms, pin, freq, duty) for every change
+
+    def __init__(self, pin, freq=0, duty=0):
+        PWM.created += 1
+        self.pin = pin
+        self._freq = freq
+        self._duty = duty
+        self._log()
+
+    def _log(self):
+        PWM.log.append((utime.ticks_ms(), getattr(self.pin, 'id', self.pin),
+                        self._freq, self._duty))
+        if len(PWM.log) > 4096:
+            del PWM.log[:2048]
+
+    def init(self, freq=None, duty=None):
+        if freq is not None:
+            self._freq = freq
+        if duty is not None:
+            self._duty = duty
+        self._log()
+
+    def freq(self, f=None):
+        if f is None:
+            return self._freq
+        self._freq = f
+        self._log()
+
+    def duty(self, d=None):
+        if d is None:
+            return self._duty
+        self._duty = d
+        self._log()
+
+    def deinit(self):
+        self._duty = 0
+        self._log()
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kw):
+        self.id = id
+        self.callback = None
+        self.due = 0
+        self.period = 0
+        self.mode = Timer.PERIODIC
+        if kw:
+            self.init(**kw)
+
+    def init(self, period=None, mode=PERIODIC, callback=None, freq=None):
+        if freq:
+            self.period = max(1, 1000000 // freq)
+        else:
+            self.period = max(1, int(period) * 1000)
+        self.mode = mode
+        self.callback = callback
+        self.due = utime.now_us() + self.period
+        utime._arm(self)
+
+    def fire(self):
+        if self.mode == Timer.PERIODIC:
+            self.due += self.period
+        else:
+            utime._disarm(self)
+        if self.callback:
+            self.callback(self)
+
+    def deinit(self):
+        utime._disarm(self)
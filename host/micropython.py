@@ -0,0 +1,36 @@
+"""Host stand-in for the micropython module."""
+
+_pending = []
+
+
+def const(x):
+    return x
+
+
+def native(f):
+    return f
+
+
+viper = native
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def schedule(func, arg):
+    # queued like on the board, run at the next safe point (after a timer
+    # callback or a sleep)
+    if len(_pending) >= 8:
+        raise RuntimeError('schedule queue full')
+    _pending.append((func, arg))
+
+
+def run_scheduled():
+    while _pending:
+        func, arg = _pending.pop(0)
+        func(arg)
+
+
+def mem_info(verbose=None):
+    print('mem: host')
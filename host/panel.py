@@ -0,0 +1,163 @@
+"""
+Model of an SSD1306 panel fed from the fake SPI / I2C bus.
+
+It decodes the command and data stream the driver sends into a 128x64
+GDDRAM, so frame dumps show what the controller would display, including
+partial windows, the display start line and inversion.
+"""
+
+from . import machine
+
+# opcode -> number of argument bytes
+_ARGS = {
+    0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0x8d: 1, 0xa8: 1, 0xd3: 1, 0xd5: 1,
+    0xd9: 1, 0xda: 1, 0xdb: 1, 0x26: 6, 0x27: 6, 0x29: 5, 0x2a: 5, 0xa3: 2,
+}
+
+
+class Panel:
+    def __init__(self, width=128, height=64):
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.ram = bytearray(self.pages * width)
+        self.col0, self.col1 = 0, width - 1
+        self.page0, self.page1 = 0, self.pages - 1
+        self.col, self.page = 0, 0
+        self.start_line = 0
+        self.inverted = False
+        self.on = False
+        self.contrast = 0xff
+        self.scrolling = False
+        self.cmds = 0
+        self.data_bytes = 0
+        self._op = None
+        self._args = []
+        self._dc_pin = None
+
+    # bus attachment
+
+    def attach_spi(self, dc_pin):
+        self._dc_pin = dc_pin
+        machine.SPI.listener = self._spi_write
+
+    def attach_i2c(self, addr=0x3c):
+        self._addr = addr
+        machine.I2C.listener = self._i2c_write
+
+    def _spi_write(self, spi, data):
+        if machine._levels.get(self._dc_pin, 0):
+            self.data(data)
+        else:
+            for b in data:
+                self.command(b)
+
+    def _i2c_write(self, i2c, addr, data):
+        if addr != self._addr or not data:
+            return
+        i = 0
+        while i < len(data):
+            ctrl = data[i]
+            i += 1
+            if ctrl & 0x80:
+                # Co=1, a single byte follows, then another control byte
+                if i < len(data):
+                    if ctrl & 0x40:
+                        self.data(data[i:i + 1])
+                    else:
+                        self.command(data[i])
+                i += 1
+            else:
+                if ctrl & 0x40:
+                    self.data(data[i:])
+                else:
+                    for b in data[i:]:
+                        self.command(b)
+                return
+
+    # controller
+
+    def command(self, b):
+        self.cmds += 1
+        if self._op is not None:
+            self._args.append(b)
+            if len(self._args) == _ARGS[self._op]:
+                self._execute(self._op, self._args)
+                self._op = None
+            return
+        if b in _ARGS:
+            self._op = b
+            self._args = []
+        else:
+            self._execute(b, ())
+
+    def _execute(self, op, args):
+        if op == 0x21:
+            self.col0, self.col1 = args[0] % self.width, args[1] % self.width
+            self.col = self.col0
+        elif op == 0x22:
+            self.page0, self.page1 = args[0] % self.pages, args[1] % self.pages
+            self.page = self.page0
+        elif op == 0x81:
+            self.contrast = args[0]
+        elif 0x40 <= op <= 0x7f:
+            self.start_line = op & 0x3f
+        elif op in (0xa6, 0xa7):
+            self.inverted = op == 0xa7
+        elif op in (0xae, 0xaf):
+            self.on = op == 0xaf
+        elif op == 0x2e:
+            self.scrolling = False
+        elif op == 0x2f:
+            self.scrolling = True
+
+    def data(self, data):
+        # horizontal addressing, wrapping inside the column / page window
+        self.data_bytes += len(data)
+        for b in data:
+            self.ram[self.page * self.width + self.col] = b
+            if self.col >= self.col1:
+                self.col = self.col0
+                self.page = self.page0 if self.page >= self.page1 else self.page + 1
+            else:
+                self.col += 1
+
+    # output
+
+    def pixel(self, x, y):
+        # what screen pixel x, y shows
+        if not self.on:
+            return 0
+        y = (y + self.start_line) % self.height
+        v = (self.ram[(y >> 3) * self.width + x] >> (y & 7)) & 1
+        return v ^ self.inverted
+
+    def ascii(self):
+        # two screen rows per text line
+        out = []
+        for y in range(0, self.height, 2):
+            line = []
+            for x in range(self.width):
+                line.append(' ▀▄█'[self.pixel(x, y) | self.pixel(x, y + 1) << 1])
+            out.append(''.join(line).rstrip())
+        return '\n'.join(out)
+
+    def png(self, path, scale=2):
+        import struct
+        import zlib
+        w, h = self.width * scale, self.height * scale
+        raw = bytearray()
+        for y in range(h):
+            raw.append(0)
+            for x in range(w):
+                raw.append(255 if self.pixel(x // scale, y // scale) else 0)
+
+        def chunk(tag, body):
+            c = struct.pack('>I', len(body)) + tag + body
+            return c + struct.pack('>I', zlib.crc32(tag + body) & 0xffffffff)
+
+        with open(path, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n')
+            f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8, 0, 0, 0, 0)))
+            f.write(chunk(b'IDAT', zlib.compress(bytes(raw))))
+            f.write(chunk(b'IEND', b''))
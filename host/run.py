@@ -0,0 +1,220 @@
+"""
+Run a game unmodified under CPython on the host emulator.
+
+    python -m host.run invader --frames 600 --input keys.txt --dump png
+
+gameESP is served from game8266.py (boards 8266spi / 8266i2c, the I2C
+variant flips the useSPI line like you would on the device) or game32.py
+(board 32). Time is virtual, so games run as fast as the host allows;
+--realtime adds the host's compute time to the clock.
+
+Every SSD1306.show() ends a frame. Frames are taken from the panel model,
+i.e. from what was actually sent over the bus. A game polling getBtn()
+without drawing (a pause screen) counts a frame every IDLE_POLLS polls,
+so scripted input can still get it going again.
+
+Input script, one line per change, held until the next line:
+
+    # frame  buttons  [paddle [paddle2]]
+    0        -
+    40       A
+    45       -
+    100      LA       300
+
+--record FILE logs the game's input with gameESP.record(), --replay FILE
+plays such a log back with gameESP.replay(), on the host or from a board.
+"""
+
+import argparse
+import importlib.abc
+import importlib.util
+import os
+import random
+import sys
+import time
+
+from . import ROOT, install
+from .board import BOARDS, LADDER, Board, Pad, parse_buttons
+from .panel import Panel
+
+
+IDLE_POLLS = 50
+
+
+class StopRun(BaseException):
+    pass
+
+
+class GameESPLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    # serves "gameESP" from game8266.py / game32.py, every import is fresh
+    # like on the ESP32 where games delete it from sys.modules on exit
+
+    def __init__(self, runner):
+        self.runner = runner
+
+    def find_spec(self, name, path, target=None):
+        if name == 'gameESP':
+            return importlib.util.spec_from_loader(name, self)
+        return None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        board = self.runner.board_name
+        path = os.path.join(ROOT, 'game32.py' if board == '32' else 'game8266.py')
+        with open(path) as f:
+            src = f.read()
+        if board == '8266i2c':
+            src = src.replace('\n        self.useSPI = True', '\n        self.useSPI = False', 1)
+        module.__file__ = path
+        exec(compile(src, path, 'exec'), module.__dict__)
+        self.runner.hook(module)
+
+
+class Runner:
+    def __init__(self, args):
+        self.args = args
+        self.board_name = args.board
+        self.frames = 0
+        self.polls = 0
+        self.script = self.load_script(args.input) if args.input else []
+        self.monkey = random.Random(args.monkey) if args.monkey is not None else None
+        self.pad = Pad()
+        self.panel = Panel()
+        self.board = Board(args.board, self.pad, self.panel)
+        self.displays = []
+        self.games = []
+
+    def load_script(self, path):
+        steps = []
+        with open(path) as f:
+            for line in f:
+                line = line.split('#', 1)[0].split()
+                if not line:
+                    continue
+                step = [int(line[0]), parse_buttons(line[1]) if len(line) > 1 else 0]
+                step += [int(v) for v in line[2:4]]
+                steps.append(step)
+        steps.sort(key=lambda s: s[0])
+        return steps
+
+    def hook(self, module):
+        runner = self
+        # SSD1306 lives in gameCore, imported once and shared by every
+        # fresh gameESP, so wrap the original show() and not the last wrapper
+        cls = module.SSD1306
+        show = cls.__dict__.get('uncounted_show') or cls.show
+        cls.uncounted_show = show
+
+        def counted_show(self, full=False):
+            show(self, full)
+            runner.frame(self)
+
+        cls.show = counted_show
+        getBtn = module.gameESP.getBtn
+
+        def polled_getBtn(self):
+            runner.polls += 1
+            if runner.polls >= IDLE_POLLS:
+                runner.frame(self.display)
+            return getBtn(self)
+
+        module.gameESP.getBtn = polled_getBtn
+        init = module.gameESP.__init__
+
+        def logged_init(self):
+            init(self)
+            runner.games.append(self)
+            if runner.args.record:
+                self.record(runner.args.record, runner.args.seed)
+            elif runner.args.replay:
+                self.replay(runner.args.replay)
+
+        module.gameESP.__init__ = logged_init
+
+    def frame(self, display):
+        if display not in self.displays:
+            self.displays.append(display)
+        self.frames += 1
+        self.polls = 0
+        n = self.frames
+        while self.script and self.script[0][0] <= n:
+            step = self.script.pop(0)
+            self.pad.btns = step[1]
+            if len(step) > 2:
+                self.pad.paddle = step[2]
+            if len(step) > 3:
+                self.pad.paddle2 = step[3]
+        if self.monkey and n % 8 == 0:
+            self.pad.btns = self.monkey.choice(list(LADDER))
+            self.pad.paddle = self.monkey.randrange(1024)
+        self.board.apply()
+        every = self.args.every
+        if every and n % every == 0:
+            self.dump(n)
+        if n >= self.args.frames:
+            raise StopRun()
+
+    def dump(self, n):
+        kind = self.args.dump
+        if kind == 'ascii':
+            print('--- frame %d  t=%dms' % (n, sys.modules['utime'].ticks_ms()))
+            print(self.panel.ascii())
+        elif kind == 'png':
+            os.makedirs(self.args.out, exist_ok=True)
+            self.panel.png(os.path.join(self.args.out, 'frame_%05d.png' % n), self.args.scale)
+
+    def run(self):
+        game = self.args.game
+        if not game.endswith('.py'):
+            game += '.py'
+        path = game if os.path.isabs(game) else os.path.join(ROOT, game)
+        sys.meta_path.insert(0, GameESPLoader(self))
+        os.chdir(ROOT)
+        import runpy
+        start = time.perf_counter()
+        try:
+            runpy.run_path(path, run_name='__main__')
+            end = 'game exited'
+        except StopRun:
+            end = 'frame limit'
+        wall = time.perf_counter() - start
+        for g in self.games:
+            g.stopInput()
+        if not self.args.every:
+            self.dump(self.frames)
+        self.report(end, wall)
+
+    def report(self, end, wall):
+        m = sys.modules['machine']
+        ms = sys.modules['utime'].ticks_ms()
+        print('%s after %d frames, %d ms virtual, %.2f s host (%.0f frames/s)' %
+              (end, self.frames, ms, wall, self.frames / wall if wall else 0))
+        print('panel: %d command bytes, %d data bytes, PWM objects created: %d' %
+              (self.panel.cmds, self.panel.data_bytes, m.PWM.created))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m host.run', description=__doc__.split('\n\n')[0])
+    ap.add_argument('game', help='game script, e.g. invader or menu.py')
+    ap.add_argument('--board', choices=BOARDS, default='8266spi')
+    ap.add_argument('--frames', type=int, default=600, help='stop after this many frames')
+    ap.add_argument('--input', help='scripted input file')
+    ap.add_argument('--monkey', type=int, help='random input with this seed')
+    ap.add_argument('--dump', choices=('ascii', 'png', 'none'), default='ascii')
+    ap.add_argument('--every', type=int, default=0, help='dump every N frames, 0 = last frame only')
+    ap.add_argument('--out', default='frames', help='directory for png dumps')
+    ap.add_argument('--scale', type=int, default=2)
+    ap.add_argument('--realtime', action='store_true', help='add host compute time to the clock')
+    ap.add_argument('--record', help='log input to this file')
+    ap.add_argument('--replay', help='play input back from this file')
+    ap.add_argument('--seed', type=int, default=0, help='random seed for --record, 0 picks one')
+    args = ap.parse_args(argv)
+    install()
+    sys.modules['utime'].realtime(args.realtime)
+    Runner(args).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Compile the background music in songs.py into packed .bin files.
+
+    python -m host.songc [outdir]
+
+Each song goes through gameESP.compileSong() and is written as the raw
+little endian array('H') gameESP.loadSong() reads back, bgm1.bin for the
+first song and so on, into the repository root by default. Copy them to
+the board's flash next to the games.
+"""
+
+import os
+import sys
+
+from . import ROOT, load_game
+from .songs import SONGS
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    out = argv[0] if argv else ROOT
+    g = load_game('8266').gameESP()
+    for n, buf in enumerate(SONGS, 1):
+        song = g.compileSong(buf)
+        if sys.byteorder != 'little':
+            song.byteswap()
+        path = os.path.join(out, 'bgm%d.bin' % n)
+        with open(path, 'wb') as f:
+            f.write(song)
+        print('%s: %d notes, %d bytes' % (path, len(song) // 2, len(song) * 2))
+
+
+if __name__ == '__main__':
+    main()
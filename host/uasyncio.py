@@ -0,0 +1,171 @@
+"""
+Host stand-in for uasyncio, running on the virtual clock of host/utime.py.
+
+Covers what gameESP uses: run, create_task, sleep, sleep_ms, Event and
+Task.cancel. When every task is asleep the clock jumps to the next wake up.
+"""
+
+import traceback
+
+from . import utime
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class _Sleep:
+    def __init__(self, us):
+        self.us = us
+
+    def __await__(self):
+        yield self
+
+
+class _Wait:
+    def __init__(self, ev):
+        self.ev = ev
+
+    def __await__(self):
+        if not self.ev.state:
+            yield self
+        return True
+
+
+class _Join:
+    def __init__(self, task):
+        self.task = task
+
+
+_ready = []
+_sleeping = []      # [due_us, task]
+_main = None
+
+
+class Task:
+    def __init__(self, coro):
+        self.coro = coro
+        self.done = False
+        self.result = None
+        self.error = None
+        self.joiners = []
+        self.cancelling = False
+        self.waiting = None
+
+    def cancel(self):
+        if self.done or self.cancelling:
+            return False
+        self.cancelling = True
+        _unblock(self)
+        if self not in _ready:
+            _ready.append(self)
+        return True
+
+    def __await__(self):
+        while not self.done:
+            yield _Join(self)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class Event:
+    def __init__(self):
+        self.state = False
+        self.waiting = []
+
+    def set(self):
+        self.state = True
+        for t in self.waiting:
+            t.waiting = None
+            _ready.append(t)
+        self.waiting = []
+
+    def clear(self):
+        self.state = False
+
+    def is_set(self):
+        return self.state
+
+    def wait(self):
+        return _Wait(self)
+
+
+def _unblock(task):
+    for s in _sleeping:
+        if s[1] is task:
+            _sleeping.remove(s)
+            break
+    if task.waiting is not None:
+        task.waiting.remove(task)
+        task.waiting = None
+
+
+def _step(task):
+    if task.done:
+        return
+    try:
+        if task.cancelling:
+            task.cancelling = False
+            y = task.coro.throw(CancelledError())
+        else:
+            y = task.coro.send(None)
+    except StopIteration as e:
+        task.done = True
+        task.result = e.value
+    except CancelledError as e:
+        task.done = True
+        task.error = e
+    except Exception as e:
+        task.done = True
+        task.error = e
+        if not task.joiners and task is not _main:
+            traceback.print_exc()
+    else:
+        if isinstance(y, _Sleep):
+            _sleeping.append([utime.now_us() + y.us, task])
+        elif isinstance(y, _Wait):
+            task.waiting = y.ev.waiting
+            y.ev.waiting.append(task)
+        elif isinstance(y, _Join):
+            y.task.joiners.append(task)
+        else:
+            _ready.append(task)
+        return
+    _ready.extend(task.joiners)
+    task.joiners = []
+
+
+def create_task(coro):
+    t = Task(coro)
+    _ready.append(t)
+    return t
+
+
+def sleep_ms(ms):
+    return _Sleep(max(0, int(ms)) * 1000)
+
+
+def sleep(s):
+    return _Sleep(max(0, int(s * 1000000)))
+
+
+def run(coro):
+    global _main
+    main = _main = create_task(coro)
+    while not main.done:
+        if _ready:
+            _step(_ready.pop(0))
+            continue
+        if not _sleeping:
+            raise RuntimeError('all tasks blocked')
+        s = min(_sleeping, key=lambda s: s[0])
+        utime.advance_us(s[0] - utime.now_us())
+        now = utime.now_us()
+        for s in list(_sleeping):
+            if s[0] <= now:
+                _sleeping.remove(s)
+                _ready.append(s[1])
+    if main.error:
+        raise main.error
+    return main.result
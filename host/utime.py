@@ -0,0 +1,106 @@
+"""
+Host stand-in for utime, driven by a virtual clock.
+
+Sleeping does not block, it moves the clock forward and fires the machine
+Timer callbacks that fall due on the way, so games run unthrottled.
+With realtime(True) the host's own elapsed time is added to the clock,
+so time spent computing shows up in ticks_us() as it would on a board.
+"""
+
+import time
+
+_slept = 0          # us added by sleeps
+_start = time.perf_counter_ns()
+_real = False
+_timers = []        # armed machine.Timer objects
+_firing = False
+
+
+def realtime(on=True):
+    global _real, _start
+    _real = on
+    _start = time.perf_counter_ns()
+
+
+def now_us():
+    if _real:
+        return _slept + (time.perf_counter_ns() - _start) // 1000
+    return _slept
+
+
+def ticks_us():
+    return now_us()
+
+
+def ticks_ms():
+    return now_us() // 1000
+
+
+def ticks_cpu():
+    return now_us()
+
+
+def ticks_diff(a, b):
+    return a - b
+
+
+def ticks_add(a, b):
+    return a + b
+
+
+def time_ns():
+    return now_us() * 1000
+
+
+def _arm(timer):
+    if timer not in _timers:
+        _timers.append(timer)
+
+
+def _disarm(timer):
+    if timer in _timers:
+        _timers.remove(timer)
+
+
+def run_timers():
+    # fire every timer that is due by now, in due order
+    global _firing
+    if _firing:
+        return
+    _firing = True
+    try:
+        while _timers:
+            t = min(_timers, key=lambda x: x.due)
+            if t.due > now_us():
+                break
+            t.fire()
+    finally:
+        _firing = False
+    from . import micropython
+    micropython.run_scheduled()
+
+
+def advance_us(us):
+    # move the clock forward, firing timers at their due time
+    global _slept
+    end = now_us() + max(0, us)
+    while True:
+        due = [t.due for t in _timers if t.due <= end]
+        if not due or _firing:
+            break
+        _slept += max(0, min(due) - now_us())
+        run_timers()
+    _slept += max(0, end - now_us())
+    run_timers()
+
+
+def sleep_us(us):
+    advance_us(us)
+
+
+def sleep_ms(ms):
+    advance_us(int(ms * 1000))
+
+
+def sleep(s):
+    advance_us(int(s * 1000000))
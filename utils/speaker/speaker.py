@@ -5,9 +5,15 @@ Created on: 2018. 7. 10
 Author: Joshua Yang (joshua.yang@hardkernel.com)
 """
 
-from machine import PWM, Pin
+from machine import DAC, PWM, Pin, Timer
+from micropython import const
+import micropython
 import utime
 
+# highest rate play_music() drives the DAC at, every sample is a timer
+# callback. resample faster recordings before flashing them
+MAX_SAMPLE_RATE = const(8000)
+
 
 class Speaker:
     _speaker_pin = object()
@@ -17,10 +23,27 @@ class Speaker:
     _beep_frequency = 0
     _volume_duty = 0
 
-    def __init__(self, pin, dac_pin, frequency=262, duration=0, volume=1):
+    # sample playback, see play_music()
+    _dac = None
+    _timer = None
+    _timer_id = 0
+    _playing = False
+    _ended = False
+    _file = None
+    _stream = None
+    _halves = None
+    _buf = None
+    _pos = 0
+    _half = -1
+    _size = 0
+    _stop = 0
+    underruns = 0
+
+    def __init__(self, pin, dac_pin, frequency=262, duration=0, volume=1, timer=0):
         self._speaker_pin = Pin(pin, Pin.OUT, value=1)
         self._speaker_pwm = PWM(self._speaker_pin, duty=0)
         self._dac_pin = Pin(dac_pin, Pin.OUT, value=1)
+        self._timer_id = timer
 
         self.set_beep(frequency, duration)
         self.set_volume(volume)
@@ -67,6 +90,108 @@ class Speaker:
             self._beep_frequency = self._beep_frequency if frequency is None else frequency
             self._beep_duration = self._beep_duration if duration is None else duration
 
-    # TODO: Not implemented yet
-    def play_music(self, music_data, sample_rate):
-        pass
+    def play_music(self, music_data, sample_rate, buffer_size=512):
+        """
+        Plays unsigned 8-bit mono PCM through the DAC on the speaker pin
+        and returns at once. music_data is a bytes-like object or the path
+        of a raw PCM file, which is streamed from flash through a double
+        buffer of 2 * buffer_size bytes: a timer writes one sample per
+        tick and a half that has been played is refilled by
+        micropython.schedule() outside the interrupt.
+        sample_rate must not be above MAX_SAMPLE_RATE.
+        """
+        if not 0 < sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError("sample_rate must be 1 to %d" % MAX_SAMPLE_RATE)
+        self.stop_music()
+        if isinstance(music_data, str):
+            self._file = open(music_data, 'rb')
+            if self._stream is None or len(self._stream) != buffer_size * 2:
+                self._stream = bytearray(buffer_size * 2)
+                view = memoryview(self._stream)
+                self._halves = (view[:buffer_size], view[buffer_size:])
+            self._buf = self._stream
+            self._size = buffer_size * 2
+            self._half = buffer_size
+            self._stop = -1
+            self._fill(0)
+            self._fill(buffer_size)
+        else:
+            self._buf = music_data
+            self._size = self._stop = len(music_data)
+            self._half = -1
+        if self._stop == 0:
+            self._done(0)
+            return False
+        self._pos = 0
+        self._speaker_pwm.deinit()
+        if self._dac is None:
+            self._dac = DAC(self._speaker_pin)
+            self._timer = Timer(self._timer_id)
+            # bound once, the interrupt must not allocate
+            self._sample_cb = self._next_sample
+            self._fill_cb = self._fill
+            self._done_cb = self._done
+        self._dac_switch(1)
+        self._playing = True
+        self._timer.init(freq=sample_rate, mode=Timer.PERIODIC, callback=self._sample_cb)
+        return True
+
+    def stop_music(self):
+        if self._playing:
+            self._timer.deinit()
+            self._done(0)
+
+    def is_playing(self):
+        if self._ended:
+            # the last sample played but _done() could not be scheduled
+            self._done(0)
+        return self._playing
+
+    def _next_sample(self, timer):
+        # timer callback, one sample to the DAC scaled by the volume. only
+        # small ints, nothing is allocated
+        i = self._pos
+        if i == self._stop:
+            timer.deinit()
+            try:
+                micropython.schedule(self._done_cb, 0)
+            except RuntimeError:
+                # schedule queue full, is_playing() or stop_music() finishes
+                self._ended = True
+            return
+        self._dac.write(128 + ((self._buf[i] - 128) * self._volume_duty >> 10))
+        i += 1
+        if i == self._half:
+            self._refill(0)
+        elif i == self._size and self._file:
+            i = 0
+            self._refill(self._half)
+        self._pos = i
+
+    def _refill(self, start):
+        try:
+            micropython.schedule(self._fill_cb, start)
+        except RuntimeError:
+            # schedule queue full, the half plays again
+            self.underruns += 1
+
+    def _fill(self, start):
+        # reads the next part of the file into the half starting at start,
+        # the end of the file sets where playback stops
+        if self._file is None:
+            return
+        n = self._file.readinto(self._halves[1 if start else 0]) or 0
+        if n < self._half and self._stop < 0:
+            self._stop = start + n
+
+    def _done(self, arg):
+        # back to tones once the samples have played
+        self._playing = False
+        self._ended = False
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._buf = None
+        if self._dac:
+            self._dac.write(0)
+            self._speaker_pwm.init(freq=self._beep_frequency, duty=0)